@@ -0,0 +1,78 @@
+import numpy as np
+
+from algorithms.varint import decode_varints, encode_varints
+
+# Размер заголовка RAW-файла из convert_png_to_raw: ширина и высота по 4 байта
+HEADER_SIZE = 8
+
+
+def bit_rle_compress(raw_data: bytes) -> bytes:
+    """
+    Сжимает упакованное 1-битное RAW-изображение (режим "1" из convert_png_to_raw)
+    кодированием длин серий бит по строкам развертки, как в факсимильном кодировании.
+    Каждая строка начинается с серии нулевых бит (возможно, пустой), далее цвета чередуются;
+    длины серий записываются в формате varint.
+    :param raw_data: RAW-данные: ширина, высота (по 4 байта) и биты пикселей, упакованные np.packbits.
+    :return: Сжатые данные: тот же заголовок и длины серий.
+    """
+    width, height = read_header(raw_data)
+    if width * height == 0:
+        return raw_data[:HEADER_SIZE]
+
+    # Распаковываем биты и раскладываем их по строкам развертки
+    bits = np.unpackbits(np.frombuffer(raw_data, dtype=np.uint8, offset=HEADER_SIZE))
+    rows = bits[:width * height].reshape(height, width)
+
+    # Перед каждой строкой добавляем нулевой бит: первая серия строки всегда нулевого цвета
+    padded = np.zeros((height, width + 1), dtype=np.uint8)
+    padded[:, 1:] = rows
+    changes = np.flatnonzero((padded[:, 1:] != padded[:, :-1]).ravel())
+
+    # Границы серий в координатах padded: начала строк и смены цвета внутри строк
+    row_starts = np.arange(height, dtype=np.int64) * (width + 1)
+    change_positions = (changes // width) * (width + 1) + changes % width + 1
+    boundaries = np.union1d(row_starts, change_positions)
+    lengths = np.diff(np.append(boundaries, height * (width + 1)))
+
+    # Первая серия каждой строки включает добавленный бит - вычитаем его
+    lengths[np.searchsorted(boundaries, row_starts)] -= 1
+
+    return raw_data[:HEADER_SIZE] + encode_varints(lengths)
+
+
+def bit_rle_decompress(compressed_data: bytes) -> bytes:
+    """
+    Восстанавливает 1-битное RAW-изображение, сжатое bit_rle_compress.
+    :param compressed_data: Сжатые данные.
+    :return: RAW-данные (байтовая строка).
+    """
+    width = int.from_bytes(compressed_data[:4], "big")
+    height = int.from_bytes(compressed_data[4:8], "big")
+    lengths = decode_varints(compressed_data[HEADER_SIZE:]).astype(np.int64)
+    if int(lengths.sum()) != width * height:
+        raise ValueError("Run lengths do not match the image size")
+    if width * height == 0:
+        return compressed_data[:HEADER_SIZE]
+
+    # Серия начинает строку, если до нее набрано целое число строк, а предыдущая серия
+    # непустая (пустой может быть только первая серия строки)
+    before = np.cumsum(lengths) - lengths
+    is_row_start = before % width == 0
+    is_row_start[1:] &= lengths[:-1] > 0
+
+    # Цвет серии - четность ее номера внутри строки
+    run_numbers = np.arange(len(lengths))
+    row_first_run = np.maximum.accumulate(np.where(is_row_start, run_numbers, 0))
+    colors = ((run_numbers - row_first_run) & 1).astype(np.uint8)
+
+    bits = np.repeat(colors, lengths)
+    return compressed_data[:HEADER_SIZE] + np.packbits(bits).tobytes()
+
+
+def read_header(raw_data: bytes) -> tuple[int, int]:
+    # Проверяем, что размер данных соответствует упакованному 1-битному изображению
+    width = int.from_bytes(raw_data[:4], "big")
+    height = int.from_bytes(raw_data[4:8], "big")
+    if len(raw_data) < HEADER_SIZE or len(raw_data) - HEADER_SIZE != (width * height + 7) // 8:
+        raise ValueError("Data is not a packed 1-bit RAW image")
+    return width, height
@@ -0,0 +1,80 @@
+class BitWriter:
+    """
+    Побитовая запись в байтовый буфер. Биты копятся в целом числе и сбрасываются
+    в буфер целыми байтами, старший бит - первым.
+    """
+
+    def __init__(self):
+        self.output = bytearray()  # Уже сформированные байты
+        self.accumulator = 0  # Еще не сброшенные биты
+        self.bit_count = 0  # Количество бит в accumulator
+
+    def write(self, value: int, width: int):
+        """
+        Записывает width младших бит числа value.
+        :param value: Неотрицательное число, помещающееся в width бит.
+        :param width: Количество бит.
+        """
+        self.accumulator = (self.accumulator << width) | value
+        self.bit_count += width
+        if self.bit_count >= 64:
+            self.flush_bytes()
+
+    def flush_bytes(self):
+        """Переносит в выходной буфер все целые байты из накопителя."""
+        rest = self.bit_count & 7
+        self.output += (self.accumulator >> rest).to_bytes(self.bit_count >> 3, "big")
+        self.accumulator &= (1 << rest) - 1
+        self.bit_count = rest
+
+    def getvalue(self) -> bytes:
+        """
+        Возвращает записанные данные, дополняя последний байт нулевыми битами.
+        :return: Байтовая строка.
+        """
+        padding = -self.bit_count & 7
+        return bytes(self.output) + (self.accumulator << padding).to_bytes((self.bit_count + padding) >> 3, "big")
+
+
+class BitReader:
+    """
+    Побитовое чтение из байтовой строки (старший бит - первым).
+    Накопитель пополняется по 8 байт, поэтому чтение поля не зависит от длины потока.
+    """
+
+    def __init__(self, data: bytes, position: int = 0):
+        """
+        :param data: Байтовая строка.
+        :param position: Позиция байта, с которого начинается битовый поток.
+        """
+        self.data = data
+        self.position = position  # Следующий байт для загрузки в накопитель
+        self.accumulator = 0
+        self.bit_count = 0
+
+    def refill(self, width: int) -> bool:
+        """
+        Загружает байты, пока в накопителе меньше width бит.
+        :return: False, если данных не хватило.
+        """
+        while self.bit_count < width:
+            chunk = self.data[self.position:self.position + 8]
+            if not chunk:
+                return False
+            self.accumulator = (self.accumulator << (8 * len(chunk))) | int.from_bytes(chunk, "big")
+            self.bit_count += 8 * len(chunk)
+            self.position += len(chunk)
+        return True
+
+    def read(self, width: int) -> int:
+        """
+        Читает width бит.
+        :param width: Количество бит.
+        :return: Прочитанное число.
+        """
+        if self.bit_count < width and not self.refill(width):
+            raise ValueError("Unexpected end of bit stream")
+        self.bit_count -= width
+        value = self.accumulator >> self.bit_count
+        self.accumulator &= (1 << self.bit_count) - 1
+        return value
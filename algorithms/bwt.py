@@ -1,4 +1,26 @@
-def bwt_transform(data: bytes, chunk_size: int = 1024) -> tuple[bytes, list[int]]:
+import numpy as np
+
+from algorithms.parallel import read_shared, resolve_workers, run_in_pool, split_aligned, write_shared
+from algorithms.suffix_array import sort_rotations
+from algorithms.varint import decode_varint, encode_varint
+
+# С какого числа полных чанков обратное преобразование идет по всем цепочкам одновременно
+BATCH_MIN_CHUNKS = 32
+# Сколько групп чанков приходится на один процесс (мелкие группы выравнивают нагрузку)
+TASKS_PER_WORKER = 4
+# Версия формата заголовка BWT-потока
+BWT_FORMAT_VERSION = 1
+
+
+def bwt_transform(data: bytes, chunk_size: int = 1024, workers: int | None = 1) -> tuple[bytes, list[int]]:
+    # Чанки независимы, поэтому при нескольких процессах раздаем их группами в пул
+    workers = resolve_workers(workers)
+    if workers > 1 and len(data) > chunk_size:
+        tasks = [(start, end, chunk_size) for start, end in split_aligned(len(data), chunk_size, workers * TASKS_PER_WORKER)]
+        results, transformed_data = run_in_pool(transform_block_shared, data, tasks, workers, len(data))
+        # Индексы собираем в порядке групп
+        return transformed_data, [index for block_indices in results for index in block_indices]
+
     transformed_data = bytearray()  # Буфер для преобразованных данных
     indices = []  # Список индексов для каждого чанка
 
@@ -12,57 +34,125 @@ def bwt_transform(data: bytes, chunk_size: int = 1024) -> tuple[bytes, list[int]
     return bytes(transformed_data), indices
 
 
-def transform_chunk(chunk: bytes) -> tuple[int, bytes]:
-    # Генерируем все возможные вращения строки
-    rotations = [chunk[i:] + chunk[:i] for i in range(len(chunk))]
+def transform_block_shared(input_name: str, output_name: str, start: int, end: int, chunk_size: int) -> list[int]:
+    # Задача пула: преобразуем группу чанков и пишем результат на то же место выходного буфера
+    transformed_data, indices = bwt_transform(read_shared(input_name, start, end), chunk_size)
+    write_shared(output_name, start, transformed_data)
+    return indices
+
 
-    # Сортируем вращения лексикографически
-    rotations.sort()
+def transform_chunk(chunk: bytes) -> tuple[int, bytes]:
+    # Сортируем циклические сдвиги через ранги (удвоение префиксов), не строя сами сдвиги
+    symbols = np.frombuffer(chunk, dtype=np.uint8)
+    order, rank = sort_rotations(symbols)
 
-    # Находим индекс исходной строки в отсортированном списке
-    original_index = rotations.index(chunk)
+    # Индекс исходной строки - первая позиция среди сдвигов, равных ей
+    original_index = int(np.count_nonzero(rank < rank[0]))
 
-    # Берем последние символы всех вращений
-    encoded_chunk = bytes(rotation[-1] for rotation in rotations)
+    # Последний символ сдвига, начинающегося с позиции i, - это chunk[i - 1]
+    encoded_chunk = symbols[order - 1].tobytes()
 
     return original_index, encoded_chunk
 
 
-def bwt_inverse(transformed_data: bytes, indices: list[int], chunk_size: int = 1024) -> bytes:
-    restored_data = bytearray()  # Буфер для восстановленных данных
-    position = 0  # Текущая позиция в данных
-    index = 0  # Индекс текущего чанка
+def bwt_inverse(transformed_data: bytes, indices: list[int], chunk_size: int = 1024, workers: int | None = 1) -> bytes:
+    total = len(transformed_data)
+    if total == 0:
+        return b''
 
-    while position < len(transformed_data):
-        # Определяем границы текущего чанка
-        end = position + chunk_size if position + chunk_size <= len(transformed_data) else len(transformed_data)
-        chunk = transformed_data[position:end]  # Берем текущий чанк
-        original_index = indices[index]  # Получаем индекс для этого чанка
+    workers = resolve_workers(workers)
+    if workers > 1 and total > chunk_size:
+        # Каждая задача получает свою группу чанков и соответствующий срез индексов
+        tasks = [(start, end, chunk_size, indices[start // chunk_size:(end + chunk_size - 1) // chunk_size])
+                 for start, end in split_aligned(total, chunk_size, workers * TASKS_PER_WORKER)]
+        _, restored_data = run_in_pool(inverse_block_shared, transformed_data, tasks, workers, total)
+        return restored_data
 
-        # Восстанавливаем чанк
-        restored_chunk = reverse_transform_chunk(original_index, chunk)
-        restored_data.extend(restored_chunk)
+    last_column = np.frombuffer(transformed_data, dtype=np.uint8)
+    # LF-отображение сразу для всех чанков: устойчивая сортировка по паре (номер чанка, символ)
+    # дает для каждой строки отсортированной таблицы номер следующей строки
+    next_row = next_rows(last_column, chunk_size)
 
-        # Переходим к следующему чанку
-        position = end
-        index += 1
+    restored = np.empty(total, dtype=np.uint8)  # Буфер для восстановленных данных
+    full_chunks = total // chunk_size  # Количество полных чанков
 
-    return bytes(restored_data)
+    if full_chunks >= BATCH_MIN_CHUNKS:
+        # Идем по цепочкам всех полных чанков одновременно: один векторный шаг на позицию в чанке
+        starts = np.arange(full_chunks, dtype=np.int64) * chunk_size
+        rows = starts + np.asarray(indices[:full_chunks], dtype=np.int64)
+        for step in range(chunk_size):
+            rows = next_row[rows]
+            restored[starts + step] = last_column[rows]
+        first_single = full_chunks
+    else:
+        first_single = 0
 
+    # Оставшиеся чанки (неполный последний или немногочисленные большие) проходим поштучно
+    if first_single * chunk_size < total:
+        next_row_list = next_row.tolist()
+        for chunk_index in range(first_single, len(indices)):
+            start = chunk_index * chunk_size
+            end = min(start + chunk_size, total)
+            restored[start:end] = walk_chain(next_row_list, transformed_data, start + indices[chunk_index], end - start)
 
-def reverse_transform_chunk(original_index: int, encoded_chunk: bytes) -> bytes:
-    # Создаем таблицу пар (символ, исходный индекс)
-    table = [(char, idx) for idx, char in enumerate(encoded_chunk)]
+    return restored.tobytes()
 
-    # Сортируем таблицу лексикографически
-    table.sort()
 
-    result = bytearray()  # Буфер для результата
-    current_row = original_index  # Начинаем с оригинального индекса
+def inverse_block_shared(input_name: str, output_name: str, start: int, end: int, chunk_size: int,
+                         indices: list[int]):
+    # Задача пула: восстанавливаем группу чанков на ее место в выходном буфере
+    write_shared(output_name, start, bwt_inverse(read_shared(input_name, start, end), indices, chunk_size))
 
-    for _ in range(len(encoded_chunk)):
-        # Получаем символ и следующий индекс
-        char, current_row = table[current_row]
-        result.append(char)  # Добавляем символ
 
-    return bytes(result)
\ No newline at end of file
+def reverse_transform_chunk(original_index: int, encoded_chunk: bytes) -> bytes:
+    # Таблица следующих строк для одного чанка
+    next_row = next_rows(np.frombuffer(encoded_chunk, dtype=np.uint8), len(encoded_chunk))
+    return bytes(walk_chain(next_row.tolist(), encoded_chunk, original_index, len(encoded_chunk)))
+
+
+def next_rows(last_column: np.ndarray, chunk_size: int) -> np.ndarray:
+    # Ключ позиции - (номер чанка, символ); устойчивость сохраняет порядок одинаковых символов,
+    # поэтому order[row] - позиция в последнем столбце, с которой продолжается строка row
+    chunk_ids = np.arange(len(last_column), dtype=np.int64) // chunk_size
+    keys = chunk_ids * 256 + last_column
+    return np.argsort(keys, kind="stable")
+
+
+def walk_chain(next_row: list[int], last_column: bytes, row: int, length: int) -> bytearray:
+    result = bytearray(length)  # Буфер для результата
+    for position in range(length):
+        # Переходим к следующей строке и берем ее символ
+        row = next_row[row]
+        result[position] = last_column[row]
+    return result
+
+
+def serialize_bwt_header(indices: list[int], chunk_size: int, original_length: int) -> bytes:
+    # Заголовок: версия, размер чанка, исходная длина и индексы чанков (все числа - varint)
+    header = bytearray([BWT_FORMAT_VERSION])
+    header += encode_varint(chunk_size)
+    header += encode_varint(original_length)
+    for index in indices:
+        header += encode_varint(index)
+    return bytes(header)
+
+
+def deserialize_bwt_header(data: bytes, pos: int = 0) -> tuple[int, int, list[int], int]:
+    # Проверяем версию формата
+    if pos >= len(data) or data[pos] != BWT_FORMAT_VERSION:
+        raise ValueError("Unsupported BWT stream version")
+    pos += 1
+
+    chunk_size, pos = decode_varint(data, pos)
+    original_length, pos = decode_varint(data, pos)
+    if chunk_size == 0:
+        raise ValueError("Invalid BWT chunk size")
+
+    # Количество индексов однозначно следует из длины и размера чанка
+    indices = []
+    for _ in range((original_length + chunk_size - 1) // chunk_size):
+        index, pos = decode_varint(data, pos)
+        indices.append(index)
+
+    # Возвращаем параметры и позицию сразу после заголовка
+    return chunk_size, original_length, indices, pos
@@ -1,6 +1,31 @@
 import heapq  # Импорт модуля для работы с кучей (приоритетной очередью)
-from collections import Counter  # Импорт Counter для подсчета частот символов
-import pickle  # Импорт модуля для сериализации/десериализации объектов Python
+
+import numpy as np
+
+from algorithms.varint import decode_varint, encode_varint
+
+# Версия формата сжатых данных
+HUFFMAN_FORMAT_VERSION = 1
+# Способы записи длин кодов в заголовке:
+# по 4 бита на символ (если длины не больше 15), по байту на символ,
+# или только ненулевые длины парами (символ, длина) - для данных с малым числом разных символов
+LENGTHS_NIBBLES = 0
+LENGTHS_BYTES = 1
+LENGTHS_SPARSE = 2
+# Наибольшая длина кода по умолчанию: таблицы декодирования остаются небольшими,
+# а длины помещаются в 4 бита заголовка
+HUFFMAN_MAX_CODE_LENGTH = 15
+# Разрядность таблицы первого уровня декодировщика: коды не длиннее декодируются одним обращением,
+# более длинные - через таблицу второго уровня для их первых HUFFMAN_TABLE_BITS бит
+HUFFMAN_TABLE_BITS = 11
+# Декодировщик читает код из 64-битного окна, сдвинутого на 0..7 бит, поэтому длина кода ограничена
+MAX_DECODABLE_LENGTH = 57
+# Сколько байт битового потока декодируется за один векторный шаг
+DECODE_SEGMENT_SIZE = 1 << 16
+# Сколько символов пропускается за один переход при поиске границ кодов (степень двойки)
+DECODE_JUMP = 64
+# Сколько символов кодируется за один векторный шаг
+ENCODE_CHUNK_SIZE = 1 << 16
 
 
 class Node:
@@ -38,7 +63,13 @@ def count_symb(data: bytes) -> dict:
     :param data: Входные данные (байтовая строка).
     :return: Словарь с частотами символов (ключ - символ, значение - частота).
     """
-    return Counter(data)  # Используем Counter для автоматического подсчета частот
+    # Векторный подсчет вместо Counter: на больших данных он в десятки раз быстрее.
+    # bincount приводит байты к int64, поэтому данные считаются участками
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, len(symbols), 16 * ENCODE_CHUNK_SIZE):
+        counts += np.bincount(symbols[start:start + 16 * ENCODE_CHUNK_SIZE], minlength=256)
+    return {symbol: int(counts[symbol]) for symbol in np.flatnonzero(counts).tolist()}
 
 
 def build_huffman_tree(frequency: dict) -> Node:
@@ -88,45 +119,355 @@ def generate_codes(node: Node, code: str = "", codes: dict = None) -> dict:
     return codes
 
 
-def huffman_compress(data: bytes) -> bytes:
+def package_merge(frequency: dict, max_length: int) -> dict:
+    """
+    Оптимальные длины кодов, не превышающие max_length (алгоритм package-merge).
+    Монеты - символы с весом-частотой; на каждом из max_length - 1 шагов соседние пары
+    самых легких элементов списка объединяются в пакеты и сливаются с исходными монетами.
+    Длина кода символа - число вхождений его монет в 2n - 2 самых легких элементов итогового списка.
+    :param frequency: Словарь с частотами символов (не меньше двух символов).
+    :param max_length: Наибольшая длина кода.
+    :return: Словарь: символ -> длина кода.
+    """
+    leaves = sorted((weight, (symbol,)) for symbol, weight in frequency.items())
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [(first[0] + second[0], first[1] + second[1]) for first, second in zip(items[0::2], items[1::2])]
+        # При равных весах монеты идут раньше пакетов
+        items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+
+    lengths = dict.fromkeys(frequency, 0)
+    for _, symbols in items[:2 * len(leaves) - 2]:
+        for symbol in symbols:
+            lengths[symbol] += 1
+    return lengths
+
+
+def code_lengths(frequency: dict, max_length: int = HUFFMAN_MAX_CODE_LENGTH) -> list[int]:
+    """
+    Вычисляет длины кодов Хаффмана для всех 256 значений байта.
+    Если дерево Хаффмана дает коды длиннее max_length (сильно неравномерные частоты),
+    длины строятся заново алгоритмом package-merge.
+    :param frequency: Словарь с частотами символов.
+    :param max_length: Наибольшая длина кода.
+    :return: Список из 256 длин (0 - символ не встречается).
+    """
+    if not 1 <= max_length <= MAX_DECODABLE_LENGTH or len(frequency) > 1 << max_length:
+        raise ValueError(f"Maximum code length {max_length} cannot encode {len(frequency)} symbols")
+    lengths = [0] * 256
+    if not frequency:
+        return lengths
+    for symbol, code in generate_codes(build_huffman_tree(frequency)).items():
+        # Единственному символу дерево дает пустой код - ему нужен хотя бы один бит
+        lengths[symbol] = max(1, len(code))
+    if max(lengths) > max_length:
+        for symbol, length in package_merge(frequency, max_length).items():
+            lengths[symbol] = length
+    return lengths
+
+
+def canonical_codes(lengths: list[int]) -> dict:
+    """
+    Строит канонические коды по длинам: символы упорядочиваются по (длина, символ),
+    и каждый следующий код на единицу больше предыдущего (со сдвигом при росте длины).
+    Поэтому для восстановления кодов достаточно хранить одни длины.
+    :param lengths: Длины кодов (0 - символ не встречается).
+    :return: Словарь: символ -> (код, длина).
+    """
+    codes = {}
+    code = 0
+    previous_length = 0
+    for length, symbol in sorted((length, symbol) for symbol, length in enumerate(lengths) if length):
+        code <<= length - previous_length
+        codes[symbol] = (code, length)
+        code += 1
+        previous_length = length
+    return codes
+
+
+def serialize_code_lengths(lengths: list[int]) -> bytes:
+    """
+    Записывает длины кодов самым коротким из способов LENGTHS_*.
+    :param lengths: 256 длин кодов.
+    :return: Байт способа и сами длины.
+    """
+    used = [(symbol, length) for symbol, length in enumerate(lengths) if length]
+    if 2 * len(used) + 1 < 128:
+        return bytes([LENGTHS_SPARSE, len(used)]) + bytes(value for pair in used for value in pair)
+    if max(lengths) <= 15:
+        return bytes([LENGTHS_NIBBLES]) + bytes((lengths[i] << 4) | lengths[i + 1] for i in range(0, 256, 2))
+    return bytes([LENGTHS_BYTES]) + bytes(lengths)
+
+
+def deserialize_code_lengths(data: bytes, pos: int = 0) -> tuple[list[int], int]:
+    """
+    Читает длины кодов, записанные serialize_code_lengths.
+    :param data: Байтовая строка.
+    :param pos: Позиция байта способа записи.
+    :return: 256 длин кодов и позиция сразу после них.
+    """
+    if pos >= len(data):
+        raise ValueError("Truncated Huffman header")
+    mode = data[pos]
+    pos += 1
+    if mode == LENGTHS_SPARSE:
+        if pos >= len(data):
+            raise ValueError("Truncated Huffman header")
+        count = data[pos]
+        pairs = data[pos + 1:pos + 1 + 2 * count]
+        if len(pairs) != 2 * count:
+            raise ValueError("Truncated Huffman header")
+        lengths = [0] * 256
+        for i in range(0, len(pairs), 2):
+            lengths[pairs[i]] = pairs[i + 1]
+        return lengths, pos + 1 + 2 * count
+    if mode == LENGTHS_NIBBLES:
+        packed = data[pos:pos + 128]
+        if len(packed) != 128:
+            raise ValueError("Truncated Huffman header")
+        return [length for byte in packed for length in (byte >> 4, byte & 0x0F)], pos + 128
+    if mode == LENGTHS_BYTES:
+        if len(data) < pos + 256:
+            raise ValueError("Truncated Huffman header")
+        return list(data[pos:pos + 256]), pos + 256
+    raise ValueError("Unknown Huffman code length table format")
+
+
+def build_decode_tables(lengths: list[int], table_bits: int = HUFFMAN_TABLE_BITS) -> tuple:
+    """
+    Строит двухуровневые таблицы декодирования канонических кодов.
+    Элемент таблицы первого уровня с индексом - первыми table_bits битами потока - хранит символ
+    и длину кода, если код не длиннее table_bits. Для префиксов длинных кодов длина равна 0,
+    а ссылка (смещение, разрядность) указывает на участок таблицы второго уровня,
+    индексируемый следующими битами. Длина 0 без ссылки - недопустимая последовательность.
+    :param lengths: Длины кодов.
+    :param table_bits: Разрядность таблицы первого уровня.
+    :return: Кортеж (table_bits, символы, длины, смещения ссылок, разрядности ссылок,
+             символы второго уровня, длины второго уровня).
+    """
+    max_length = max(lengths)
+    if max_length > MAX_DECODABLE_LENGTH:
+        raise ValueError("Huffman code is too long")
+    # Неравенство Крафта: иначе канонические коды пересекаются
+    if sum(1 << (max_length - length) for length in lengths if length) > 1 << max_length:
+        raise ValueError("Invalid Huffman code lengths")
+    table_bits = max(1, min(table_bits, max_length))
+    codes = canonical_codes(lengths)
+
+    first_symbols = np.zeros(1 << table_bits, dtype=np.uint8)
+    first_lengths = np.zeros(1 << table_bits, dtype=np.uint8)
+    link_offsets = np.zeros(1 << table_bits, dtype=np.int64)
+    link_bits = np.zeros(1 << table_bits, dtype=np.uint8)
+
+    # Короткий код занимает все элементы, индексы которых начинаются с него
+    long_codes = {}
+    for symbol, (code, length) in codes.items():
+        if length <= table_bits:
+            start = code << (table_bits - length)
+            first_symbols[start:start + (1 << (table_bits - length))] = symbol
+            first_lengths[start:start + (1 << (table_bits - length))] = length
+        else:
+            long_codes.setdefault(code >> (length - table_bits), []).append((symbol, code, length))
+
+    # Для каждого префикса длинных кодов - участок второго уровня по самому длинному из них
+    offset = 0
+    for prefix, group in long_codes.items():
+        link_offsets[prefix] = offset
+        link_bits[prefix] = max(length for _, _, length in group) - table_bits
+        offset += 1 << int(link_bits[prefix])
+    second_symbols = np.zeros(offset, dtype=np.uint8)
+    second_lengths = np.zeros(offset, dtype=np.uint8)
+    for prefix, group in long_codes.items():
+        sub_bits = int(link_bits[prefix])
+        for symbol, code, length in group:
+            rest = length - table_bits
+            start = int(link_offsets[prefix]) + ((code & ((1 << rest) - 1)) << (sub_bits - rest))
+            second_symbols[start:start + (1 << (sub_bits - rest))] = symbol
+            second_lengths[start:start + (1 << (sub_bits - rest))] = length
+
+    return table_bits, first_symbols, first_lengths, link_offsets, link_bits, second_symbols, second_lengths
+
+
+def decode_windows(windows: np.ndarray, tables: tuple, with_symbols: bool = True) -> tuple:
+    """
+    Определяет код, с которого начинается каждое окно.
+    :param windows: 64-битные окна потока (старший бит - первый).
+    :param tables: Таблицы build_decode_tables.
+    :param with_symbols: Нужны ли символы (для поиска границ кодов достаточно длин).
+    :return: Длины кодов (0 - недопустимый код) и, если запрошены, символы.
+    """
+    table_bits, first_symbols, first_lengths, link_offsets, link_bits, second_symbols, second_lengths = tables
+    index = windows >> np.uint64(64 - table_bits)
+    lengths = first_lengths[index]
+    symbols = first_symbols[index] if with_symbols else None
+
+    # Длинные коды - через таблицу второго уровня по следующим битам окна
+    long_positions = np.flatnonzero(lengths == 0)
+    long_positions = long_positions[link_bits[index[long_positions]] != 0]
+    if len(long_positions):
+        long_index = index[long_positions]
+        rest = (windows[long_positions] << np.uint64(table_bits)) >> (64 - link_bits[long_index]).astype(np.uint64)
+        second_index = link_offsets[long_index] + rest.astype(np.int64)
+        lengths[long_positions] = second_lengths[second_index]
+        if with_symbols:
+            symbols[long_positions] = second_symbols[second_index]
+    return lengths, symbols
+
+
+def decode_symbols(payload: bytes, lengths: list[int], count: int) -> bytes:
     """
-    Кодирование данных с использованием алгоритма Хаффмана.
-    Сохраняет таблицу кодов в сжатых данных.
+    Табличное декодирование count символов из битового потока.
+    Поток обрабатывается сегментами: для каждой битовой позиции сегмента векторно читается
+    64-битное окно и по таблицам определяется длина кода, начинающегося с нее. Затем по переходам
+    "позиция -> позиция + длина кода" выбирается цепочка позиций, на которых действительно
+    начинаются коды: переходы через DECODE_JUMP символов строятся удвоением, по ним
+    последовательно находятся начала групп, а сами группы заполняются векторно.
+    Символы определяются только для позиций цепочки.
+    :param payload: Битовый поток (старший бит - первым).
+    :param lengths: Длины кодов.
+    :param count: Количество символов.
+    :return: Декодированные данные.
+    """
+    if count == 0:
+        return b""
+    tables = build_decode_tables(lengths)
+    total_bits = 8 * len(payload)
+    padded = np.concatenate([np.frombuffer(payload, dtype=np.uint8), np.zeros(8, dtype=np.uint8)]).astype(np.uint64)
+    bit_shifts = np.tile(np.arange(8, dtype=np.uint64), DECODE_SEGMENT_SIZE)
+    positions = np.arange(8 * DECODE_SEGMENT_SIZE + MAX_DECODABLE_LENGTH, dtype=np.int64)
+    output = []
+    decoded = 0
+    position = 0  # Начало следующего кода (в битах)
+
+    while decoded < count:
+        segment_start = position >> 3
+        if segment_start >= len(payload):
+            raise ValueError("Truncated Huffman data")
+        segment_end = min(segment_start + DECODE_SEGMENT_SIZE, len(payload))
+        size = segment_end - segment_start
+
+        # Окна: 8 байт с начала каждого байта сегмента, сдвинутые на 0..7 бит
+        words = np.zeros(size, dtype=np.uint64)
+        for k in range(8):
+            words = (words << np.uint64(8)) | padded[segment_start + k:segment_end + k]
+        windows = np.repeat(words, 8) << bit_shifts[:8 * size]
+        code_sizes, _ = decode_windows(windows, tables, with_symbols=False)
+
+        # Переходы к началу следующего кода. Позиции за концом сегмента переходят сами в себя,
+        # как и позиции с недопустимым кодом (длина 0): цепочка на них останавливается
+        bit_count = 8 * size
+        jumps = positions[:bit_count + MAX_DECODABLE_LENGTH].copy()
+        jumps[:bit_count] += code_sizes
+
+        # Переходы через DECODE_JUMP символов и начала групп по ним
+        far_jumps = jumps
+        for _ in range(DECODE_JUMP.bit_length() - 1):
+            far_jumps = np.take(far_jumps, far_jumps)
+        group_starts = [position - 8 * segment_start]
+        while len(group_starts) * DECODE_JUMP < count - decoded:
+            following = int(far_jumps[group_starts[-1]])
+            if following == group_starts[-1]:  # Цепочка остановилась
+                break
+            group_starts.append(following)
+
+        # Позиции кодов внутри групп
+        starts = np.empty((len(group_starts), DECODE_JUMP), dtype=np.int64)
+        starts[:, 0] = group_starts
+        for column in range(1, DECODE_JUMP):
+            starts[:, column] = np.take(jumps, starts[:, column - 1])
+        starts = starts.ravel()
+        starts = starts[:min(int(np.searchsorted(starts, bit_count)), count - decoded)]
+        if not len(starts):
+            raise ValueError("Truncated Huffman data")
+
+        code_sizes, symbols = decode_windows(windows[starts], tables)
+        if not code_sizes.all():
+            raise ValueError("Invalid Huffman code in encoded data")
+        output.append(symbols.tobytes())
+        decoded += len(starts)
+        position = 8 * segment_start + int(starts[-1]) + int(code_sizes[-1])
+
+    if position > total_bits:
+        raise ValueError("Truncated Huffman data")
+    return b"".join(output)
+
+
+def encode_symbols(data: bytes, lengths: list[int]) -> bytes:
+    """
+    Векторное кодирование данных каноническими кодами.
+    Коды и длины символов берутся из таблиц по 256 элементов, битовые смещения кодов - накопленной
+    суммой длин. Коды собираются в 64-битные слова: код, не поместившийся в свое слово, делится
+    между ним и следующим. Коды не пересекаются по битам, поэтому вклады в слово объединяются
+    через OR. Данные обрабатываются участками по ENCODE_CHUNK_SIZE символов; неполное последнее
+    слово участка переносится в следующий.
+    :param data: Входные данные.
+    :param lengths: Длины кодов (не больше 57 бит).
+    :return: Битовый поток, дополненный нулями до целого байта.
+    """
+    code_table = np.zeros(256, dtype=np.uint64)
+    length_table = np.zeros(256, dtype=np.int64)
+    for symbol, (code, length) in canonical_codes(lengths).items():
+        code_table[symbol] = code
+        length_table[symbol] = length
+
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    output = []
+    carry_word = np.uint64(0)  # Неполное последнее слово предыдущего участка
+    carry_bits = 0  # Количество бит в нем
+
+    for chunk_start in range(0, len(symbols), ENCODE_CHUNK_SIZE):
+        chunk = symbols[chunk_start:chunk_start + ENCODE_CHUNK_SIZE]
+        codes = code_table[chunk]
+        code_sizes = length_table[chunk]
+        ends = np.cumsum(code_sizes) + carry_bits
+        starts = ends - code_sizes
+        word_index = starts >> 6
+
+        # Сдвиг кода в его слове; отрицательный - код выходит за границу слова
+        shifts = 64 - (starts & 63) - code_sizes
+        split = shifts < 0
+        heads = (codes << np.maximum(shifts, 0).astype(np.uint64)) >> np.maximum(-shifts, 0).astype(np.uint64)
+
+        words = np.zeros((int(ends[-1]) + 63) >> 6, dtype=np.uint64)
+        words[0] = carry_word
+        first_in_word = np.flatnonzero(np.diff(word_index, prepend=-1))
+        words[word_index[first_in_word]] |= np.bitwise_or.reduceat(heads, first_in_word)
+        # Остаток разделенного кода - в старшие биты следующего слова
+        words[word_index[split] + 1] |= codes[split] << (64 + shifts[split]).astype(np.uint64)
+
+        total_bits = int(ends[-1])
+        carry_bits = total_bits & 63
+        if carry_bits:
+            carry_word = words[-1]
+            words = words[:-1]
+        else:
+            carry_word = np.uint64(0)
+        output.append(words.astype(">u8").tobytes())
+
+    # Неполное слово - до целого байта
+    output.append(int(carry_word).to_bytes(8, "big")[:(carry_bits + 7) >> 3])
+    return b"".join(output)
+
+
+def huffman_compress(data: bytes, max_length: int = HUFFMAN_MAX_CODE_LENGTH) -> bytes:
+    """
+    Кодирование данных с использованием канонических кодов Хаффмана.
+    Заголовок: версия формата, длины кодов (см. serialize_code_lengths) и длина исходных данных (varint);
+    сами коды восстанавливаются по длинам.
     :param data: Входные данные (байтовая строка).
+    :param max_length: Наибольшая длина кода.
     :return: Закодированные данные (байтовая строка).
     """
     # Шаг 1: Подсчет частот символов
     frequency = count_symb(data)
-    # Шаг 2: Построение дерева Хаффмана
-    huffman_tree = build_huffman_tree(frequency)
-    # Шаг 3: Генерация кодов Хаффмана для каждого символа
-    huffman_codes = generate_codes(huffman_tree)
-
-    # Шаг 4: Кодирование данных с использованием полученных кодов
-    encoded_bits = "".join([huffman_codes[byte] for byte in data])
-
-    # Шаг 5: Добавление padding (выравнивание до целого числа байт)
-    padding = 8 - len(encoded_bits) % 8
-    if padding == 8:  # Если бит уже кратно 8, padding не нужен
-        padding = 0
-    encoded_bits += "0" * padding  # Добавляем нулевые биты для выравнивания
-
-    # Преобразуем битовую строку в байты
-    encoded_bytes = bytes([int(encoded_bits[i:i + 8], 2) for i in range(0, len(encoded_bits), 8)])
-
-    # Шаг 6: Упаковка метаданных (таблица кодов и padding)
-    metadata = {
-        "codes": huffman_codes,  # Таблица кодов Хаффмана
-        "padding": padding,  # Количество добавленных бит для выравнивания
-    }
-    # Сериализуем метаданные в байты
-    metadata_bytes = pickle.dumps(metadata)
-
-    # Возвращаем результат:
-    # 1. 4 байта - длина метаданных
-    # 2. Сериализованные метаданные
-    # 3. Закодированные данные
-    return len(metadata_bytes).to_bytes(4, "big") + metadata_bytes + encoded_bytes
+    # Шаг 2: Длины кодов по дереву Хаффмана (с ограничением длины)
+    lengths = code_lengths(frequency, max_length)
+    # Шаг 3: Кодирование данных каноническими кодами
+    encoded_bytes = encode_symbols(data, lengths)
+
+    # Шаг 4: Заголовок - версия, длины кодов и длина исходных данных
+    header = bytes([HUFFMAN_FORMAT_VERSION]) + serialize_code_lengths(lengths) + encode_varint(len(data))
+    return header + encoded_bytes
 
 
 def huffman_decompress(encoded_data: bytes) -> bytes:
@@ -135,35 +476,13 @@ def huffman_decompress(encoded_data: bytes) -> bytes:
     :param encoded_data: Закодированные данные (байтовая строка).
     :return: Восстановленные данные (байтовая строка).
     """
-    # Шаг 1: Извлечение длины метаданных (первые 4 байта)
-    metadata_length = int.from_bytes(encoded_data[:4], "big")
-    # Шаг 2: Извлечение самих метаданных
-    metadata_bytes = encoded_data[4:4 + metadata_length]
-    # Шаг 3: Оставшаяся часть - закодированные данные
-    encoded_bytes = encoded_data[4 + metadata_length:]
-
-    # Шаг 4: Десериализация метаданных
-    metadata = pickle.loads(metadata_bytes)
-    huffman_codes = metadata["codes"]  # Таблица кодов Хаффмана
-    padding = metadata["padding"]  # Количество бит padding
-
-    # Шаг 5: Преобразование байтов в битовую строку
-    encoded_bits = "".join([f"{byte:08b}" for byte in encoded_bytes])
-    # Удаление добавленных бит padding
-    encoded_bits = encoded_bits[:-padding] if padding > 0 else encoded_bits
-
-    # Шаг 6: Создание обратного словаря (код -> символ)
-    reverse_codes = {v: k for k, v in huffman_codes.items()}
-
-    # Шаг 7: Декодирование битовой строки
-    current_bits = ""  # Текущая накопленная битовая последовательность
-    decoded_data = []  # Список для хранения декодированных символов
-    for bit in encoded_bits:
-        current_bits += bit  # Добавляем очередной бит
-        # Если текущая последовательность соответствует какому-то коду
-        if current_bits in reverse_codes:
-            decoded_data.append(reverse_codes[current_bits])  # Добавляем символ
-            current_bits = ""  # Сбрасываем текущую последовательность
-
-    # Возвращаем декодированные данные как байтовую строку
-    return bytes(decoded_data)
\ No newline at end of file
+    # Шаг 1: Чтение заголовка
+    if not encoded_data or encoded_data[0] != HUFFMAN_FORMAT_VERSION:
+        raise ValueError("Unsupported Huffman format version")
+    lengths, pos = deserialize_code_lengths(encoded_data, 1)
+    original_length, pos = decode_varint(encoded_data, pos)
+    # Шаг 2: Оставшаяся часть - закодированные данные
+    encoded_bytes = encoded_data[pos:]
+
+    # Шаг 3: Табличное декодирование по длинам кодов
+    return decode_symbols(encoded_bytes, lengths, original_length)
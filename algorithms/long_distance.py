@@ -0,0 +1,137 @@
+import numpy as np
+
+# Минимальная длина дальнего совпадения (длина окна скользящего хеша)
+LDM_MIN_LENGTH = 64
+# Шаг опорных позиций: в таблицу попадает каждая LDM_STRIDE-я позиция, поэтому находится
+# любой повтор длиной от LDM_MIN_LENGTH + LDM_STRIDE - 1
+LDM_STRIDE = 16
+# Размер таблицы опорных позиций - 2^LDM_TABLE_BITS записей (16 байт на запись)
+LDM_TABLE_BITS = 20
+# Сколько позиций хешируется за один векторный шаг
+LDM_SEGMENT_SIZE = 1 << 20
+# Основание полиномиального хеша (нечетное, поэтому обратимо по модулю 2^64)
+HASH_BASE = 0x100000001B3
+HASH_BASE_INVERSE = pow(HASH_BASE, -1, 1 << 64)
+
+
+def hash_powers(base: int, count: int) -> np.ndarray:
+    """
+    Степени base^0 .. base^(count - 1) по модулю 2^64.
+    """
+    powers = np.full(count, base, dtype=np.uint64)
+    powers[0] = 1
+    return np.cumprod(powers, dtype=np.uint64)  # Переполнение uint64 - это и есть взятие по модулю 2^64
+
+
+def rolling_hashes(window: np.ndarray, length: int, powers: np.ndarray, inverse_powers: np.ndarray) -> np.ndarray:
+    """
+    Полиномиальные хеши всех подстрок длины length массива window, посчитанные векторно.
+    Хеш подстроки s[k:k + length] - сумма s[j] * B^(k + length - 1 - j): префиксные суммы
+    s[j] * B^(-j) дают сумму по окну, умножение на B^(k + length - 1) приводит ее к общему виду.
+    :param window: Байты (uint64).
+    :param length: Длина подстрок.
+    :return: Массив хешей (uint64) для каждой начальной позиции.
+    """
+    prefix = np.zeros(len(window) + 1, dtype=np.uint64)
+    np.cumsum(window * inverse_powers[:len(window)], out=prefix[1:])
+    count = len(window) - length + 1
+    return (prefix[length:length + count] - prefix[:count]) * powers[length - 1:length - 1 + count]
+
+
+def extend_match(data: bytes, source: int, position: int, limit: int) -> int:
+    """
+    Длина общего префикса data[source:] и data[position:] (не больше limit).
+    Сравнивает блоками растущего размера, поэтому длинные повторы проверяются быстро.
+    """
+    length = 0
+    step = 256
+    while length < limit:
+        size = min(step, limit - length)
+        if data[source + length:source + length + size] == data[position + length:position + length + size]:
+            length += size
+            step *= 2
+        elif size <= 16:
+            while length < limit and data[source + length] == data[position + length]:
+                length += 1
+            break
+        else:
+            step = size // 2
+    return length
+
+
+def find_long_matches(data: bytes, min_length: int = LDM_MIN_LENGTH, stride: int = LDM_STRIDE,
+                      table_bits: int = LDM_TABLE_BITS) -> list[tuple[int, int, int]]:
+    """
+    Ищет длинные повторы на любом расстоянии от текущей позиции.
+    Хеши всех подстрок длины min_length считаются векторно по сегментам; опорные позиции
+    (кратные stride) записываются в таблицу фиксированного размера (новая позиция вытесняет
+    старую с тем же индексом), а каждая позиция ищет в ней и среди опорных позиций своего
+    сегмента предыдущую подстроку с тем же хешем. Кандидаты проверяются побайтно и жадно
+    продлеваются вперед; совпадения не пересекаются.
+    :param data: Исходные данные.
+    :param min_length: Минимальная длина совпадения.
+    :param stride: Шаг опорных позиций.
+    :param table_bits: Логарифм размера таблицы.
+    :return: Список троек (позиция, смещение, длина) по возрастанию позиции.
+    """
+    n = len(data)
+    matches = []
+    if n < 2 * min_length:
+        return matches
+
+    shift = np.uint64(64 - table_bits)
+    table_positions = np.full(1 << table_bits, -1, dtype=np.int64)
+    table_hashes = np.zeros(1 << table_bits, dtype=np.uint64)
+    powers = hash_powers(HASH_BASE, LDM_SEGMENT_SIZE + min_length)
+    inverse_powers = hash_powers(HASH_BASE_INVERSE, LDM_SEGMENT_SIZE + min_length)
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    covered = 0  # Конец последнего выбранного совпадения
+
+    for start in range(0, n - min_length + 1, LDM_SEGMENT_SIZE):
+        end = min(start + LDM_SEGMENT_SIZE, n - min_length + 1)  # Начала подстрок сегмента
+        hashes = rolling_hashes(symbols[start:end + min_length - 1].astype(np.uint64), min_length,
+                                powers, inverse_powers)
+        buckets = (hashes >> shift).astype(np.int64)
+        positions = np.arange(start, end, dtype=np.int64)
+
+        # Кандидаты из предыдущих сегментов
+        candidates = table_positions[buckets]
+        candidates[table_hashes[buckets] != hashes] = -1
+
+        # Кандидаты среди опорных позиций сегмента: ближайшая предыдущая с тем же индексом таблицы.
+        # Ключ (индекс << 40) | позиция упорядочивает опорные позиции по индексу, затем по позиции
+        anchors = np.flatnonzero(positions % stride == 0)
+        anchor_keys = (buckets[anchors] << 40) | positions[anchors]
+        order = np.argsort(anchor_keys)
+        anchor_keys = anchor_keys[order]
+        anchors = anchors[order]
+        if len(anchors):
+            found = np.searchsorted(anchor_keys, (buckets << 40) | positions) - 1
+            valid = found >= 0
+            found = np.where(valid, found, 0)
+            nearest = anchors[found]
+            valid &= (anchor_keys[found] >> 40) == buckets
+            valid &= hashes[nearest] == hashes
+            candidates = np.where(valid, nearest + start, candidates)
+
+            # Опорные позиции сегмента - в таблицу; при совпадении индекса остается последняя
+            latest = len(order) - 1 - np.unique(buckets[anchors][::-1], return_index=True)[1]
+            table_positions[buckets[anchors[latest]]] = anchors[latest] + start
+            table_hashes[buckets[anchors[latest]]] = hashes[anchors[latest]]
+
+        # Жадный выбор непересекающихся совпадений
+        starts = np.flatnonzero(candidates >= 0) + start
+        sources = candidates[starts - start]
+        index = int(np.searchsorted(starts, covered))
+        while index < len(starts):
+            position = int(starts[index])
+            source = int(sources[index])
+            if data[source:source + min_length] == data[position:position + min_length]:
+                length = extend_match(data, source, position, n - position)
+                matches.append((position, position - source, length))
+                covered = position + length
+                index = int(np.searchsorted(starts, covered))
+            else:  # Совпадение хешей без совпадения данных
+                index += 1
+
+    return matches
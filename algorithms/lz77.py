@@ -1,45 +1,492 @@
-def lz77_encode(data: bytes, buffer_size: int = 8192) -> bytes:
+from array import array
+
+import numpy as np
+
+from algorithms.bitio import BitReader, BitWriter
+from algorithms.long_distance import find_long_matches
+from algorithms.parallel import read_shared, resolve_workers, run_in_pool
+from algorithms.suffix_array import suffix_array
+from algorithms.varint import decode_varint, encode_varint
+
+# Максимальная длина совпадения (ограничена форматом исторически - 1 байт значимой длины)
+MAX_MATCH_LENGTH = 255
+# Длина префикса, по которому строятся хеш-цепочки
+HASH_PREFIX_LENGTH = 3
+# Версия побитового формата LZSS
+LZSS_FORMAT_VERSION = 1
+# Версия потокового (покадрового) формата LZSS
+LZSS_STREAM_FORMAT_VERSION = 2
+# Версия формата LZSS с дальними совпадениями
+LZSS_LONG_FORMAT_VERSION = 3
+# Ширина поля длины дальнего совпадения
+LONG_LENGTH_BITS = 16
+# Наибольшая ширина поля длины обычного совпадения LZSS
+MAX_LENGTH_BITS = 16
+# Сколько входных байт потоковый кодировщик накапливает в один кадр
+STREAM_FRAME_SIZE = 1 << 20
+
+# Уровни сжатия: способ разбора и глубина поиска совпадений.
+# fast - жадный разбор с неглубоким поиском: в 2-4 раза быстрее default, результат больше
+#        на 5-25% (на изображениях - в разы); для потокового приема данных.
+# default - отложенный на один шаг выбор с умеренной глубиной поиска.
+# max - оптимальный разбор по модели стоимости с поиском на каждой позиции: в 2-5 раз
+#       медленнее default, результат меньше на 2-5% на тексте и в разы на изображениях;
+#       для архивного хранения.
+# Длина совпадения, после которой оптимальный разбор не ищет совпадения внутри него
+OPTIMAL_NICE_LENGTH = 64
+
+LZ77_LEVELS = {
+    "fast": ("greedy", 8),
+    "default": ("lazy", 64),
+    "max": ("optimal", 256),
+}
+
+
+class BruteForceMatchFinder:
+    """
+    Исходный поиск совпадений: перебор длин от максимальной вниз с rfind по окну.
+    Работает за O(255 * размер окна) на позицию; оставлен для сравнения.
+    """
+
+    def __init__(self, data: bytes, buffer_size: int, chain_depth: int = 0, max_length: int = MAX_MATCH_LENGTH):
+        self.data = data
+        self.buffer_size = buffer_size
+        self.max_length = max_length
+
+    def find(self, position: int) -> tuple[int, int]:
+        """
+        Ищет самое длинное совпадение для позиции position.
+        :param position: Текущая позиция в данных.
+        :return: Пара (смещение, длина); (0, 0), если совпадения нет.
+        """
+        data = self.data
+        # Определяем начало поиска в скользящем окне (не может быть < 0)
+        search_start = max(0, position - self.buffer_size)
+
+        # Ищем максимальное совпадение (начиная с самой длинной возможной последовательности)
+        for length in range(min(self.max_length, len(data) - position), 0, -1):
+            substring = data[position:position + length]  # Подстрока для поиска
+            # Ищем последнее вхождение, начинающееся до текущей позиции; совпадение
+            # может заходить на саму подстроку (перекрывающееся совпадение)
+            offset = data[search_start:position + length - 1].rfind(substring)
+            if offset != -1:  # Если нашли совпадение
+                # Вычисляем смещение от текущей позиции
+                return position - search_start - offset, length
+
+        return 0, 0
+
+
+class HashChainMatchFinder:
+    """
+    Поиск совпадений по хеш-цепочкам: для каждого 3-байтового префикса хранится последняя
+    позиция, а для каждой позиции окна - предыдущая позиция с тем же префиксом.
+    Просматривается не более chain_depth кандидатов, начиная с ближайшего.
+    """
+
+    def __init__(self, data: bytes, buffer_size: int, chain_depth: int = 64, max_length: int = MAX_MATCH_LENGTH):
+        self.data = data
+        self.buffer_size = buffer_size
+        self.chain_depth = chain_depth
+        self.max_length = max_length
+        self.head = {}  # Префикс -> последняя позиция с этим префиксом
+        # Кольцевой массив ссылок на предыдущую позицию с тем же префиксом (только в пределах окна)
+        self.window = max(1, min(buffer_size, len(data)))
+        self.previous = [-1] * self.window
+        self.inserted = 0  # Сколько начальных позиций уже добавлено в цепочки
+
+    def insert_until(self, position: int):
+        """
+        Добавляет в цепочки все позиции до position (не включая).
+        :param position: Граница добавления.
+        """
+        data = self.data
+        head = self.head
+        previous = self.previous
+        window = self.window
+        # Позиции, уже вышедшие из окна, не добавляем (их пропускают дальние совпадения)
+        first = max(self.inserted, position - window)
+        for current in range(first, min(position, len(data) - HASH_PREFIX_LENGTH + 1)):
+            key = (data[current] << 16) | (data[current + 1] << 8) | data[current + 2]
+            previous[current % window] = head.get(key, -1)
+            head[key] = current
+        self.inserted = max(self.inserted, position)
+
+    def find(self, position: int) -> tuple[int, int]:
+        """
+        Ищет самое длинное совпадение для позиции position (при равной длине - ближайшее).
+        :param position: Текущая позиция в данных.
+        :return: Пара (смещение, длина); (0, 0), если совпадения нет.
+        """
+        self.insert_until(position)
+        data = self.data
+        limit = min(self.max_length, len(data) - position)
+        if limit < HASH_PREFIX_LENGTH:
+            return 0, 0
+
+        key = (data[position] << 16) | (data[position + 1] << 8) | data[position + 2]
+        candidate = self.head.get(key, -1)
+        window_start = position - self.buffer_size
+        best_length = 0
+        best_offset = 0
+
+        for _ in range(self.chain_depth):
+            if candidate < 0 or candidate < window_start:
+                break
+            # Быстрая проверка: кандидат может быть лучше, только если совпадает байт на позиции best_length.
+            # Совпадение может заходить на текущую позицию: при offset < length декодер повторяет образец
+            if data[candidate + best_length] == data[position + best_length]:
+                length = match_length(data, candidate, position, limit)
+                if length > best_length:
+                    best_length = length
+                    best_offset = position - candidate
+                    if length == limit:  # Длиннее найти нельзя
+                        break
+            candidate = self.previous[candidate % self.window]
+
+        return best_offset, best_length
+
+
+class SuffixArrayMatchFinder:
+    """
+    Поиск совпадений по суффиксному массиву всего блока. Суффиксы с длинным общим префиксом
+    стоят в массиве рядом, и общий префикс с текущим суффиксом не растет по мере удаления от него.
+    Поэтому самое длинное совпадение с более ранней позицией дает ближайший выше или ниже
+    по массиву суффикс, начинающийся раньше текущего (построение longest previous factor).
+    Эти соседи заранее находятся для всех суффиксов за O(n) проходом со стеком, и если они
+    в окне, поиск точный и занимает O(1) независимо от размера окна - это позволяет использовать
+    окна в мегабайты. Только когда такой сосед старше окна, поиск идет дальше в ту же сторону,
+    пока общий префикс длиннее уже найденного совпадения; лимит chain_depth считает лишь
+    пройденные суффиксы старше окна.
+    """
+
+    def __init__(self, data: bytes, buffer_size: int, chain_depth: int = 64, max_length: int = MAX_MATCH_LENGTH):
+        self.data = data
+        self.buffer_size = buffer_size
+        self.chain_depth = chain_depth
+        self.max_length = max_length
+        # Суффиксы достаточно упорядочить по первым max_length + 1 байтам
+        order = suffix_array(data, max_length + 1)
+        ranks = np.empty(len(data), dtype=np.int64)
+        ranks[order] = np.arange(len(data), dtype=np.int64)
+        # array('q') дает быстрый доступ к элементам из Python и хранит 8 байт на позицию
+        self.order = array("q", order.astype(np.int64).tobytes())
+        self.ranks = array("q", ranks.tobytes())
+        self.above, self.below = self.nearest_earlier(self.order)
+
+    @staticmethod
+    def nearest_earlier(order: array) -> tuple[array, array]:
+        """
+        Для каждого ранга находит ближайший ранг выше и ниже, суффикс которого начинается раньше
+        (previous/next smaller value по позициям суффиксного массива).
+        :param order: Суффиксный массив.
+        :return: Два массива рангов (-1 - такого ранга нет).
+        """
+        nearest = []
+        for ranks in (range(len(order)), range(len(order) - 1, -1, -1)):
+            result = array("q", bytes(8 * len(order)))
+            stack = []  # Позиции, возрастающие от дна к вершине
+            stack_ranks = []
+            for rank in ranks:
+                position = order[rank]
+                while stack and stack[-1] > position:
+                    stack.pop()
+                    stack_ranks.pop()
+                result[rank] = stack_ranks[-1] if stack_ranks else -1
+                stack.append(position)
+                stack_ranks.append(rank)
+            nearest.append(result)
+        return nearest[0], nearest[1]
+
+    def find(self, position: int) -> tuple[int, int]:
+        """
+        Ищет самое длинное совпадение для позиции position. Точен, если окно покрывает блок
+        или лимит chain_depth не исчерпан.
+        :param position: Текущая позиция в данных.
+        :return: Пара (смещение, длина); (0, 0), если совпадения нет.
+        """
+        data = self.data
+        order = self.order
+        limit = min(self.max_length, len(data) - position)
+        window_start = max(0, position - self.buffer_size)
+        rank = self.ranks[position]
+        best_length = 0
+        best_offset = 0
+
+        for direction, nearest in ((-1, self.above), (1, self.below)):
+            neighbour = nearest[rank]
+            steps = self.chain_depth
+            while neighbour >= 0:
+                candidate = order[neighbour]
+                if window_start <= candidate < position:
+                    # Первый суффикс из окна в этом направлении - лучший в нем
+                    length = match_length(data, candidate, position, limit)
+                    offset = position - candidate
+                    if length > best_length or (length == best_length and length > 0 and offset < best_offset):
+                        best_length = length
+                        best_offset = offset
+                    break
+                # Суффикс старше окна (или после текущей позиции): идем дальше, пока общий префикс
+                # соседей длиннее уже найденного совпадения (дальше он только убывает).
+                # Лимит расходуют только суффиксы старше окна
+                neighbour += direction
+                steps -= candidate < window_start
+                if steps < 0 or not 0 <= neighbour < len(order):
+                    break
+                candidate = order[neighbour]
+                if data[candidate:candidate + best_length + 1] != data[position:position + best_length + 1]:
+                    break
+
+        return best_offset, best_length
+
+
+# Доступные способы поиска совпадений
+MATCH_FINDERS = {
+    "brute": BruteForceMatchFinder,
+    "hash_chain": HashChainMatchFinder,
+    "suffix_array": SuffixArrayMatchFinder,
+}
+
+
+def create_match_finder(data: bytes, buffer_size: int, match_finder: str, chain_depth: int,
+                        max_length: int = MAX_MATCH_LENGTH):
+    """
+    Создает объект поиска совпадений по имени.
+    :param match_finder: Имя способа поиска (ключ MATCH_FINDERS).
+    """
+    if match_finder not in MATCH_FINDERS:
+        raise ValueError(f"Unknown match finder: {match_finder}")
+    return MATCH_FINDERS[match_finder](data, buffer_size, chain_depth, max_length)
+
+
+def match_length(data: bytes, first: int, second: int, limit: int) -> int:
+    """
+    Длина общего префикса data[first:] и data[second:], не больше limit.
+    Сначала сравниваются срезы по 16 байт, затем остаток побайтно.
+    """
+    length = 0
+    while length + 16 <= limit and data[first + length:first + length + 16] == data[second + length:second + length + 16]:
+        length += 16
+    while length < limit and data[first + length] == data[second + length]:
+        length += 1
+    return length
+
+
+def copy_match(buffer: bytearray, position: int, offset: int, length: int):
+    """
+    Копирует length байт, начинающихся за offset байт до position, в buffer[position:].
+    Если совпадение перекрывает само себя (offset < length), копируемые байты - это образец
+    длиной offset, повторенный нужное число раз; он размножается одной операцией, а не побайтно.
+    :param buffer: Выходной буфер (position может совпадать с его длиной - тогда буфер растет).
+    :param position: Позиция записи.
+    :param offset: Смещение назад от position.
+    :param length: Длина совпадения.
+    """
+    start = position - offset
+    if start < 0:
+        raise ValueError("Match offset points before the start of data")
+    if offset >= length:
+        buffer[position:position + length] = buffer[start:start + length]
+    else:
+        pattern = buffer[start:position]
+        buffer[position:position + length] = (pattern * (length // offset + 1))[:length]
+
+
+def resolve_level(level: str, chain_depth: int | None) -> tuple[str, int]:
+    """
+    Определяет способ разбора и глубину поиска для уровня сжатия.
+    :param level: Имя уровня (ключ LZ77_LEVELS).
+    :param chain_depth: Явно заданная глубина поиска (None - по уровню).
+    :return: Пара (способ разбора, глубина поиска).
+    """
+    if level not in LZ77_LEVELS:
+        raise ValueError(f"Unknown compression level: {level}")
+    parser, level_depth = LZ77_LEVELS[level]
+    return parser, level_depth if chain_depth is None else chain_depth
+
+
+def parse_greedy(data: bytes, finder, min_length: int = 1, start: int = 0, end: int = None):
+    """
+    Жадный разбор данных на литералы и совпадения: всегда берется самое длинное совпадение.
+    :param data: Исходные данные.
+    :param finder: Объект поиска совпадений.
+    :param min_length: Минимальная длина совпадения; более короткие кодируются литералами.
+    :param start: Позиция начала разбора; data[:start] служит только историей для совпадений.
+    :param end: Позиция конца разбора (None - конец данных); совпадения обрезаются по ней.
+    :return: Генератор пар (смещение, длина); длина 0 означает литерал data[позиция].
+    """
+    i = start  # Текущая позиция в исходных данных
+    n = len(data) if end is None else end  # Граница разбора
+    while i < n:  # Пока не обработали все данные
+        # Ищем самое длинное совпадение в скользящем окне
+        offset, length = finder.find(i)
+        length = min(length, n - i)
+        if length >= min_length:  # Если нашли совпадение
+            yield offset, length
+            i += length  # Перемещаем указатель на длину совпадения
+        else:
+            yield 0, 0  # Кодируем как новый символ
+            i += 1
+
+
+def parse_lazy(data: bytes, finder, min_length: int = 1, start: int = 0, end: int = None):
+    """
+    Разбор с отложенным выбором на один шаг: если с позиции i + 1 начинается более длинное
+    совпадение, чем с i, символ i кодируется литералом, а совпадение переносится на i + 1.
+    :param data: Исходные данные.
+    :param finder: Объект поиска совпадений.
+    :param min_length: Минимальная длина совпадения.
+    :param start: Позиция начала разбора (см. parse_greedy).
+    :param end: Позиция конца разбора (см. parse_greedy).
+    :return: Генератор пар (смещение, длина), как в parse_greedy.
+    """
+    n = len(data) if end is None else end
+    i = start
+    offset, length = finder.find(start) if start < n else (0, 0)
+    length = min(length, n - i)
+    while i < n:
+        if length >= min_length and i + 1 < n:
+            next_offset, next_length = finder.find(i + 1)
+            next_length = min(next_length, n - i - 1)
+            if next_length > length:  # Выгоднее сдвинуться на символ
+                yield 0, 0
+                i += 1
+                offset, length = next_offset, next_length
+                continue
+        if length >= min_length:
+            yield offset, length
+            i += length
+        else:
+            yield 0, 0
+            i += 1
+        if i < n:
+            offset, length = finder.find(i)
+            length = min(length, n - i)
+
+
+def parse_optimal(data: bytes, finder, min_length: int, literal_cost: int, match_cost: int, start: int = 0,
+                  end: int = None):
+    """
+    Оптимальный разбор: кратчайший путь от начала к концу данных, где ребра - литералы
+    и совпадения, а вес ребра - его размер в битах. Поля токенов имеют фиксированную ширину,
+    поэтому стоимость совпадения не зависит от смещения, и для позиции достаточно самого
+    длинного совпадения: любое его начало длиной от min_length - тоже совпадение.
+    Путь считается с конца: cost[i] - минимальный размер кодирования data[start + i:end].
+    :param data: Исходные данные.
+    :param finder: Объект поиска совпадений.
+    :param min_length: Минимальная длина совпадения.
+    :param literal_cost: Размер литерала в битах.
+    :param match_cost: Размер совпадения в битах.
+    :param start: Позиция начала разбора (см. parse_greedy).
+    :param end: Позиция конца разбора (см. parse_greedy).
+    :return: Генератор пар (смещение, длина), как в parse_greedy.
+    """
+    n = (len(data) if end is None else end) - start  # Длина разбираемой части
+    offsets = array("q", bytes(8 * n))
+    lengths = array("q", bytes(8 * n))
+    i = 0
+    while i < n:
+        offset, length = finder.find(start + i)
+        length = min(length, n - i)
+        offsets[i], lengths[i] = offset, length
+        i += 1
+        if length >= OPTIMAL_NICE_LENGTH:
+            # Внутри длинного совпадения поиск не повторяем: хвосты совпадения - тоже совпадения
+            for step in range(1, length):
+                offsets[i], lengths[i] = offset, length - step
+                i += 1
+
+    cost = np.zeros(n + 1, dtype=np.int64)
+    choice = array("q", bytes(8 * n))  # Длина выбранного токена (0 - литерал)
+    for i in range(n - 1, -1, -1):
+        best = cost[i + 1] + literal_cost
+        length = lengths[i]
+        if length >= min_length:
+            # Самое дешевое продолжение после совпадения длиной min_length..length
+            tail = cost[i + min_length:i + length + 1]
+            step = int(tail.argmin())
+            if tail[step] + match_cost < best:
+                best = tail[step] + match_cost
+                choice[i] = min_length + step
+        cost[i] = best
+
+    i = 0
+    while i < n:
+        if choice[i]:
+            yield offsets[i], choice[i]
+            i += choice[i]
+        else:
+            yield 0, 0
+            i += 1
+
+
+def parse_tokens(data: bytes, finder, min_length: int, parser: str, literal_cost: int, match_cost: int,
+                 start: int = 0, end: int = None):
+    """
+    Разбирает данные на токены выбранным способом.
+    :param parser: "greedy", "lazy" или "optimal".
+    :param literal_cost: Размер литерала в битах (для оптимального разбора).
+    :param match_cost: Размер совпадения в битах (для оптимального разбора).
+    :param start: Позиция начала разбора (см. parse_greedy).
+    :param end: Позиция конца разбора (см. parse_greedy).
+    :return: Генератор пар (смещение, длина); длина 0 означает литерал.
+    """
+    if parser == "optimal":
+        return parse_optimal(data, finder, min_length, literal_cost, match_cost, start, end)
+    if parser == "lazy":
+        return parse_lazy(data, finder, min_length, start, end)
+    return parse_greedy(data, finder, min_length, start, end)
+
+
+def parse_with_long_matches(data: bytes, finder, min_length: int, parser: str, literal_cost: int, match_cost: int,
+                            start: int, long_matches: list[tuple[int, int, int]]):
+    """
+    Разбор, в который вставлены заранее найденные дальние совпадения: участки между ними
+    разбираются обычным способом, а сами совпадения выдаются как есть.
+    :param long_matches: Тройки (позиция, смещение, длина) по возрастанию позиции (см. find_long_matches).
+    :return: Генератор пар (смещение, длина), как в parse_tokens.
+    """
+    position = start
+    for match_start, offset, length in long_matches:
+        if match_start < position:
+            continue
+        yield from parse_tokens(data, finder, min_length, parser, literal_cost, match_cost, position, match_start)
+        yield offset, length
+        position = match_start + length
+    yield from parse_tokens(data, finder, min_length, parser, literal_cost, match_cost, position)
+
+
+def lz77_encode(data: bytes, buffer_size: int = 8192, match_finder: str = "hash_chain", chain_depth: int = None,
+                offset_bytes: int = 2, level: str = "default") -> bytes:
     """
     Кодирует данные с использованием алгоритма LZ77.
     :param data: Исходные данные (байтовая строка).
     :param buffer_size: Размер буфера для поиска совпадений.
+    :param match_finder: Способ поиска совпадений: "hash_chain" (по умолчанию), "suffix_array"
+                         (для окон в мегабайты) или "brute".
+    :param chain_depth: Сколько кандидатов просматривать на позицию (None - по уровню сжатия).
+    :param offset_bytes: Ширина поля смещения в байтах (3 - для окон больше 64 КБ).
+    :param level: Уровень сжатия (см. LZ77_LEVELS).
     :return: Сжатые данные (байтовая строка).
     """
+    if buffer_size >= 1 << (8 * offset_bytes):
+        raise ValueError("buffer_size does not fit into the offset field, increase offset_bytes")
+    parser, chain_depth = resolve_level(level, chain_depth)
+
     encoded_data = bytearray()  # Создаем пустой массив для сжатых данных
+    finder = create_match_finder(data, buffer_size, match_finder, chain_depth)
     i = 0  # Текущая позиция в исходных данных
-    n = len(data)  # Общая длина данных
-
-    while i < n:  # Пока не обработали все данные
-        max_length = 0  # Длина наилучшего найденного совпадения
-        max_offset = 0  # Смещение наилучшего совпадения
-
-        # Определяем границы поиска в скользящем окне:
-        search_start = max(0, i - buffer_size)  # Начало окна (не может быть < 0)
-        search_end = i  # Конец окна - текущая позиция
+    tokens = parse_tokens(data, finder, 1, parser, 8 * (offset_bytes + 3), 8 * (offset_bytes + 2))
 
-        # Ищем максимальное совпадение (начиная с самой длинной возможной последовательности)
-        for length in range(min(255, n - i), 0, -1):  # От 255 или до конца данных
-            substring = data[i:i + length]  # Подстрока для поиска
-            # Ищем последнее вхождение подстроки в окне поиска
-            offset = data[search_start:search_end].rfind(substring)
-
-            if offset != -1:  # Если нашли совпадение
-                max_length = length  # Запоминаем длину
-                # Вычисляем смещение от текущей позиции
-                max_offset = search_end - search_start - offset
-                break  # Прерываем поиск, т.к. нашли максимальную длину
-
-        if max_length > 0:  # Если нашли совпадение
-            # Кодируем offset (2 байта) и length (2 байта):
-            encoded_data.append((max_offset >> 8) & 0xFF)  # Старший байт offset
-            encoded_data.append(max_offset & 0xFF)  # Младший байт offset
-            encoded_data.append((max_length >> 8) & 0xFF)  # Старший байт length
-            encoded_data.append(max_length & 0xFF)  # Младший байт length
-            i += max_length  # Перемещаем указатель на длину совпадения
+    for offset, length in tokens:
+        if length > 0:  # Если это совпадение
+            # Кодируем offset (offset_bytes байт) и length (2 байта):
+            encoded_data += offset.to_bytes(offset_bytes, "big")
+            encoded_data.append((length >> 8) & 0xFF)  # Старший байт length
+            encoded_data.append(length & 0xFF)  # Младший байт length
+            i += length  # Перемещаем указатель на длину совпадения
         else:
             # Если совпадений нет, кодируем как новый символ
-            encoded_data.append(0)  # offset = 0 (старший байт)
-            encoded_data.append(0)  # offset = 0 (младший байт)
+            encoded_data += bytes(offset_bytes)  # offset = 0
             encoded_data.append(0)  # length = 0 (старший байт)
             encoded_data.append(0)  # length = 0 (младший байт)
             encoded_data.append(data[i])  # Сам символ (1 байт)
@@ -48,10 +495,11 @@ def lz77_encode(data: bytes, buffer_size: int = 8192) -> bytes:
     return bytes(encoded_data)  # Возвращаем сжатые данные
 
 
-def lz77_decode(encoded_data: bytes) -> bytes:
+def lz77_decode(encoded_data: bytes, offset_bytes: int = 2) -> bytes:
     """
     Декодирует данные, сжатые с использованием алгоритма LZ77.
     :param encoded_data: Сжатые данные (байтовая строка).
+    :param offset_bytes: Ширина поля смещения в байтах (как при кодировании).
     :return: Восстановленные данные (байтовая строка).
     """
     decoded_data = bytearray()  # Буфер для распакованных данных
@@ -59,20 +507,397 @@ def lz77_decode(encoded_data: bytes) -> bytes:
     n = len(encoded_data)  # Общая длина сжатых данных
 
     while i < n:  # Пока не обработали все сжатые данные
-        # Читаем offset и length (по два байта каждый):
-        # Собираем 2 байта в 16-битное число для offset
-        offset = (encoded_data[i] << 8) | encoded_data[i + 1]
+        # Читаем offset (offset_bytes байт) и length (2 байта):
+        offset = int.from_bytes(encoded_data[i:i + offset_bytes], "big")
+        i += offset_bytes
         # Собираем 2 байта в 16-битное число для length
-        length = (encoded_data[i + 2] << 8) | encoded_data[i + 3]
-        i += 4  # Перемещаем указатель на 4 байта вперед
+        length = (encoded_data[i] << 8) | encoded_data[i + 1]
+        i += 2  # Перемещаем указатель на 2 байта вперед
 
         if offset == 0 and length == 0:  # Если это одиночный символ
             decoded_data.append(encoded_data[i])  # Добавляем символ в выходные данные
             i += 1  # Перемещаем указатель на 1 байт
         else:  # Если это ссылка на предыдущие данные
-            start = len(decoded_data) - offset  # Начало совпадения в распакованных данных
-            end = start + length  # Конец совпадения
-            # Копируем найденный участок в конец буфера
-            decoded_data.extend(decoded_data[start:end])
+            # Копируем найденный участок в конец буфера (участок может перекрывать сам себя)
+            copy_match(decoded_data, len(decoded_data), offset, length)
+
+    return bytes(decoded_data)  # Возвращаем распакованные данные
+
+
+def lzss_offset_bits(buffer_size: int) -> int:
+    """
+    Ширина поля смещения LZSS для окна buffer_size.
+    """
+    return max(1, (buffer_size - 1).bit_length())
+
+
+def check_lzss_fields(min_match: int, length_bits: int):
+    """
+    Проверяет параметры полей токенов LZSS: оба хранятся в заголовке отдельными байтами.
+    """
+    if not 1 <= min_match <= 255:
+        raise ValueError(f"min_match must be in range 1..255, got {min_match}")
+    if not 1 <= length_bits <= MAX_LENGTH_BITS:
+        raise ValueError(f"length_bits must be in range 1..{MAX_LENGTH_BITS}, got {length_bits}")
+
+
+def split_long_matches(tokens, max_length: int, min_length: int):
+    """
+    Делит совпадения длиннее max_length на части (смещение у частей то же самое).
+    Остаток короче min_length не образуется: предыдущая часть укорачивается.
+    :return: Генератор пар (смещение, длина).
+    """
+    for offset, length in tokens:
+        while length > max_length:
+            piece = max_length if length - max_length >= min_length else max_length - min_length
+            yield offset, piece
+            length -= piece
+        yield offset, length
+
+
+def lzss_encode_block(data: bytes, start: int, buffer_size: int, match_finder: str, chain_depth: int, parser: str,
+                      min_match: int, length_bits: int, long_matches: list = None, long_offset_bits: int = 0) -> bytes:
+    """
+    Кодирует data[start:] в битовый поток токенов LZSS (без заголовка).
+    Совпадения могут ссылаться на data[:start] - историю предыдущих данных.
+    Если long_offset_bits > 0, максимальный код длины зарезервирован под дальнее совпадение:
+    поле смещения хранит младшие биты offset - 1, за кодом длины следуют старшие биты
+    (long_offset_bits - offset_bits бит) и length - min_match (LONG_LENGTH_BITS бит).
+    :param data: История и кодируемые данные.
+    :param start: Начало кодируемой части.
+    :param parser: Способ разбора (см. LZ77_LEVELS).
+    :param long_matches: Дальние совпадения (см. find_long_matches), вставляемые в разбор.
+    :param long_offset_bits: Ширина полного смещения дальнего совпадения (0 - без дальних совпадений).
+    :return: Битовый поток токенов, дополненный до целого байта.
+    """
+    check_lzss_fields(min_match, length_bits)
+    offset_bits = lzss_offset_bits(buffer_size)
+    window = 1 << offset_bits
+    escape = (1 << length_bits) - 1  # Код длины дальнего совпадения
+    max_length = min_match + escape - (1 if long_offset_bits else 0)
+    high_bits = long_offset_bits - offset_bits  # Старшие биты смещения дальнего совпадения
+    long_width = offset_bits + length_bits + high_bits + LONG_LENGTH_BITS
+    finder = create_match_finder(data, buffer_size, match_finder, chain_depth, max_length)
+
+    writer = BitWriter()
+    control = 0  # Флаги текущей группы токенов
+    group = 0  # Биты токенов текущей группы
+    group_width = 0  # Ширина group в битах
+    group_size = 0  # Количество токенов в группе
+    i = start  # Текущая позиция в исходных данных
+
+    if long_matches:
+        tokens = parse_with_long_matches(data, finder, min_match, parser, 9, 1 + offset_bits + length_bits, start,
+                                         long_matches)
+        tokens = split_long_matches(tokens, min_match + (1 << LONG_LENGTH_BITS) - 1, min_match)
+    else:
+        tokens = parse_tokens(data, finder, min_match, parser, 9, 1 + offset_bits + length_bits, start)
+
+    for offset, length in tokens:
+        if length:
+            control = (control << 1) | 1
+            if offset > window or length > max_length:  # Дальнее совпадение
+                value = (((offset - 1) & (window - 1)) << length_bits) | escape
+                value = (((value << high_bits) | ((offset - 1) >> offset_bits)) << LONG_LENGTH_BITS) | (length - min_match)
+                group = (group << long_width) | value
+                group_width += long_width
+            else:
+                group = (group << (offset_bits + length_bits)) | ((offset - 1) << length_bits) | (length - min_match)
+                group_width += offset_bits + length_bits
+            i += length
+        else:
+            control <<= 1
+            group = (group << 8) | data[i]
+            group_width += 8
+            i += 1
+        group_size += 1
+
+        if group_size == 8:  # Группа заполнена: управляющий байт, затем сами токены
+            writer.write(control, 8)
+            writer.write(group, group_width)
+            control = group = group_width = group_size = 0
+
+    if group_size:  # Неполная последняя группа: недостающие флаги - нули
+        writer.write(control << (8 - group_size), 8)
+        writer.write(group, group_width)
+
+    return writer.getvalue()
+
+
+def lzss_decode_block(encoded_data: bytes, payload_start: int, history: bytes, size: int, offset_bits: int,
+                      length_bits: int, min_match: int, long_offset_bits: int = 0) -> bytearray:
+    """
+    Декодирует битовый поток токенов LZSS, восстанавливающий size байт.
+    :param encoded_data: Сжатые данные.
+    :param payload_start: Начало битового потока в encoded_data.
+    :param history: Предшествующие данные, на которые могут ссылаться совпадения.
+    :param size: Длина восстанавливаемых данных.
+    :param long_offset_bits: Ширина смещения дальних совпадений (0 - их нет, см. lzss_encode_block).
+    :return: Буфер history + восстановленные данные.
+    """
+    escape = (1 << length_bits) - 1 if long_offset_bits else -1
+    high_bits = long_offset_bits - offset_bits
+    reader = BitReader(encoded_data, payload_start)
+    # Буфер выделяется сразу по итоговой длине
+    decoded_data = bytearray(len(history) + size)
+    decoded_data[:len(history)] = history
+    position = len(history)  # Позиция записи в decoded_data
+    end = len(decoded_data)
+
+    while position < end:
+        control = reader.read(8)
+        for bit in range(7, -1, -1):
+            if position >= end:
+                break
+            if (control >> bit) & 1:  # Совпадение
+                offset = reader.read(offset_bits)
+                length = reader.read(length_bits)
+                if length == escape:  # Дальнее совпадение
+                    offset |= reader.read(high_bits) << offset_bits
+                    length = reader.read(LONG_LENGTH_BITS)
+                offset += 1
+                length += min_match
+                if position + length > end:
+                    raise ValueError("LZSS match runs past the end of data")
+                copy_match(decoded_data, position, offset, length)
+                position += length
+            else:  # Литерал
+                decoded_data[position] = reader.read(8)
+                position += 1
+
+    return decoded_data
+
+
+def lzss_stream_header(buffer_size: int, length_bits: int, min_match: int) -> bytes:
+    """
+    Заголовок потокового формата LZSS: версия и параметры полей токенов.
+    """
+    return bytes([LZSS_STREAM_FORMAT_VERSION, lzss_offset_bits(buffer_size), length_bits, min_match])
+
+
+def lzss_frame(size: int, payload: bytes) -> bytes:
+    """
+    Кадр потокового формата LZSS: длина исходных данных, длина битового потока и сам поток.
+    """
+    return encode_varint(size) + encode_varint(len(payload)) + payload
+
+
+def encode_block_shared(input_name: str, output_name: str, start: int, end: int, buffer_size: int,
+                        match_finder: str, chain_depth: int, parser: str, min_match: int, length_bits: int) -> bytes:
+    # Задача пула: кодируем блок [start, end), подгружая перед ним buffer_size байт истории,
+    # чтобы совпадения на границе блока не терялись
+    history_start = max(0, start - buffer_size)
+    block = read_shared(input_name, history_start, end)
+    return lzss_encode_block(block, start - history_start, buffer_size, match_finder, chain_depth, parser,
+                             min_match, length_bits)
+
+
+def lzss_encode(data: bytes, buffer_size: int = 8192, match_finder: str = "hash_chain", chain_depth: int = None,
+                min_match: int = 3, length_bits: int = 8, level: str = "default", workers: int | None = 1,
+                block_size: int = STREAM_FRAME_SIZE, long_distance: bool = False) -> bytes:
+    """
+    Кодирует данные в побитово упакованный формат LZSS.
+    Литерал занимает 1 флаговый бит и 8 бит символа, совпадение - 1 флаговый бит,
+    offset - 1 (ширина по размеру окна) и length - min_match (length_bits бит).
+    Флаги восьми идущих подряд токенов собраны в управляющий байт перед ними.
+    Заголовок: версия, ширина смещения, ширина длины, min_match и исходная длина (varint).
+    :param data: Исходные данные (байтовая строка).
+    :param buffer_size: Размер окна поиска совпадений.
+    :param match_finder: Способ поиска совпадений (см. MATCH_FINDERS).
+    :param chain_depth: Сколько кандидатов просматривать на позицию (None - по уровню сжатия).
+    :param min_match: Минимальная длина совпадения (более короткие выгоднее кодировать литералами).
+    :param length_bits: Ширина поля длины совпадения.
+    :param level: Уровень сжатия (см. LZ77_LEVELS).
+    :param workers: Количество процессов (None - по числу ядер). При нескольких процессах данные
+                    делятся на блоки по block_size байт, окно каждого блока заполняется последними
+                    buffer_size байтами предыдущего, а результат записывается в потоковом формате
+                    (кадр на блок) - его так же читает lzss_decode.
+    :param block_size: Размер блока для параллельного режима.
+    :param long_distance: Искать длинные повторы (от LDM_MIN_LENGTH байт) по всему файлу, а не только
+                          в окне (см. find_long_matches); заголовок тогда хранит ширину их смещения.
+                          Только для последовательного режима.
+    :return: Сжатые данные (байтовая строка).
+    """
+    check_lzss_fields(min_match, length_bits)
+    parser, chain_depth = resolve_level(level, chain_depth)
+    workers = resolve_workers(workers)
+    if long_distance and workers > 1:
+        raise ValueError("long_distance matching is not supported with workers > 1")
+    if workers > 1 and len(data) > block_size:
+        blocks = [(start, min(start + block_size, len(data))) for start in range(0, len(data), block_size)]
+        tasks = [(start, end, buffer_size, match_finder, chain_depth, parser, min_match, length_bits)
+                 for start, end in blocks]
+        payloads, _ = run_in_pool(encode_block_shared, data, tasks, workers)
+        frames = [lzss_frame(end - start, payload) for (start, end), payload in zip(blocks, payloads)]
+        return lzss_stream_header(buffer_size, length_bits, min_match) + b"".join(frames) + encode_varint(0)
+
+    offset_bits = lzss_offset_bits(buffer_size)
+    if long_distance:
+        long_offset_bits = max(offset_bits, (len(data) - 1).bit_length())
+        payload = lzss_encode_block(data, 0, buffer_size, match_finder, chain_depth, parser, min_match, length_bits,
+                                    find_long_matches(data), long_offset_bits)
+        header = bytes([LZSS_LONG_FORMAT_VERSION, offset_bits, length_bits, min_match, long_offset_bits])
+    else:
+        payload = lzss_encode_block(data, 0, buffer_size, match_finder, chain_depth, parser, min_match, length_bits)
+        header = bytes([LZSS_FORMAT_VERSION, offset_bits, length_bits, min_match])
+    return header + encode_varint(len(data)) + payload
+
+
+def lzss_decode(encoded_data: bytes) -> bytes:
+    """
+    Декодирует данные, сжатые lzss_encode или потоковым LZSSStreamEncoder.
+    :param encoded_data: Сжатые данные (байтовая строка).
+    :return: Восстановленные данные (байтовая строка).
+    """
+    if encoded_data[:1] == bytes([LZSS_STREAM_FORMAT_VERSION]):
+        decoder = LZSSStreamDecoder()
+        decoded_data = decoder.decompress(encoded_data)
+        if not decoder.eof:
+            raise ValueError("Truncated LZSS stream")
+        return decoded_data
+
+    if encoded_data[:1] == bytes([LZSS_LONG_FORMAT_VERSION]) and len(encoded_data) >= 5:
+        long_offset_bits = encoded_data[4]
+        position = 5
+    elif encoded_data[:1] == bytes([LZSS_FORMAT_VERSION]) and len(encoded_data) >= 4:
+        long_offset_bits = 0
+        position = 4
+    else:
+        raise ValueError("Unsupported LZSS stream version")
+    offset_bits, length_bits, min_match = encoded_data[1:4]
+    original_length, position = decode_varint(encoded_data, position)
+    return bytes(lzss_decode_block(encoded_data, position, b"", original_length, offset_bits, length_bits, min_match,
+                                   long_offset_bits))
+
+
+class LZSSStreamEncoder:
+    """
+    Потоковый кодировщик LZSS: принимает данные порциями и выдает сжатый поток по мере готовности.
+    Входные данные копятся до frame_size байт и кодируются кадром; совпадения кадра могут
+    ссылаться на последние buffer_size байт предыдущих кадров. Память - O(buffer_size + frame_size)
+    независимо от размера всего потока.
+    Формат: версия, ширина смещения, ширина длины, min_match; затем кадры
+    [varint длина данных кадра][varint длина битового потока][битовый поток]; кадр нулевой длины - конец.
+    """
+
+    def __init__(self, buffer_size: int = 8192, match_finder: str = "hash_chain", chain_depth: int = None,
+                 min_match: int = 3, length_bits: int = 8, level: str = "default",
+                 frame_size: int = STREAM_FRAME_SIZE):
+        """
+        Параметры - как у lzss_encode; frame_size - размер кадра в байтах исходных данных.
+        """
+        check_lzss_fields(min_match, length_bits)
+        self.parser, self.chain_depth = resolve_level(level, chain_depth)
+        self.buffer_size = buffer_size
+        self.match_finder = match_finder
+        self.min_match = min_match
+        self.length_bits = length_bits
+        self.frame_size = max(1, frame_size)
+        self.history = b""  # Последние buffer_size байт уже закодированных данных
+        self.pending = bytearray()  # Данные, еще не попавшие в кадр
+        self.header_written = False
+
+    def header(self) -> bytes:
+        """Возвращает заголовок потока при первом вызове и пустую строку при остальных."""
+        if self.header_written:
+            return b""
+        self.header_written = True
+        return lzss_stream_header(self.buffer_size, self.length_bits, self.min_match)
+
+    def encode_frame(self, size: int) -> bytes:
+        """
+        Кодирует первые size байт из pending в кадр.
+        :return: Кадр с длинами.
+        """
+        block = self.history + bytes(self.pending[:size])
+        del self.pending[:size]
+        payload = lzss_encode_block(block, len(self.history), self.buffer_size, self.match_finder,
+                                    self.chain_depth, self.parser, self.min_match, self.length_bits)
+        self.history = block[-self.buffer_size:]
+        return lzss_frame(size, payload)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Добавляет порцию данных.
+        :param chunk: Очередная порция исходных данных.
+        :return: Готовая часть сжатого потока (может быть пустой).
+        """
+        self.pending += chunk
+        output = bytearray(self.header())
+        while len(self.pending) >= self.frame_size:
+            output += self.encode_frame(self.frame_size)
+        return bytes(output)
+
+    def flush(self) -> bytes:
+        """
+        Кодирует оставшиеся данные и завершает поток.
+        :return: Последняя часть сжатого потока.
+        """
+        output = bytearray(self.header())
+        if self.pending:
+            output += self.encode_frame(len(self.pending))
+        output += encode_varint(0)
+        return bytes(output)
+
+
+class LZSSStreamDecoder:
+    """
+    Потоковый декодировщик формата LZSSStreamEncoder. Хранит только окно восстановленных
+    данных и еще не полный кадр сжатого потока.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()  # Непрочитанная часть сжатого потока
+        self.fields = None  # (ширина смещения, ширина длины, min_match) из заголовка
+        self.history = b""  # Окно последних восстановленных данных
+        self.eof = False  # Прочитан ли признак конца потока
+
+    def read_frame(self) -> bytes | None:
+        """
+        Декодирует очередной кадр из buffer.
+        :return: Восстановленные данные кадра; None, если кадр получен не целиком.
+        """
+        try:
+            length, position = decode_varint(self.buffer)
+            if length == 0:
+                self.eof = True
+                del self.buffer[:position]
+                return b""
+            payload_length, position = decode_varint(self.buffer, position)
+        except ValueError:  # Длины кадра еще не получены целиком
+            return None
+        if len(self.buffer) < position + payload_length:
+            return None
+
+        offset_bits, length_bits, min_match = self.fields
+        payload = bytes(self.buffer[position:position + payload_length])
+        del self.buffer[:position + payload_length]
+        decoded = lzss_decode_block(payload, 0, self.history, length, offset_bits, length_bits, min_match)
+        frame = bytes(decoded[len(self.history):])
+        self.history = bytes(decoded[-(1 << offset_bits):])
+        return frame
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """
+        Добавляет порцию сжатого потока.
+        :param chunk: Очередная порция сжатых данных.
+        :return: Восстановленные данные всех полученных целиком кадров.
+        """
+        if self.eof:
+            return b""
+        self.buffer += chunk
+        if self.fields is None:
+            if len(self.buffer) < 4:
+                return b""
+            if self.buffer[0] != LZSS_STREAM_FORMAT_VERSION:
+                raise ValueError("Unsupported LZSS stream version")
+            self.fields = tuple(self.buffer[1:4])
+            del self.buffer[:4]
 
-    return bytes(decoded_data)  # Возвращаем распакованные данные
\ No newline at end of file
+        output = bytearray()
+        while not self.eof:
+            frame = self.read_frame()
+            if frame is None:
+                break
+            output += frame
+        return bytes(output)
@@ -1,103 +1,250 @@
+from array import array
+from collections import OrderedDict
+
+from algorithms.bitio import BitReader, BitWriter
+from algorithms.varint import decode_varint, encode_varint
+
+# Политики заполненного словаря (значение - код политики в заголовке):
+# reset - словарь очищается и строится заново,
+# freeze - словарь больше не меняется,
+# lru - новая фраза занимает код давно не использованной фразы-листа
+LZ78_POLICIES = {"reset": 0, "freeze": 1, "lru": 2}
+# Емкость словаря по умолчанию (коды помещаются в 2 байта)
+LZ78_DEFAULT_CAPACITY = 1 << 16
+
+
+# Порядок использования фраз-листьев словаря для политики lru.
+# Кодировщик и декодировщик ведут его одинаково: фраза используется, когда ее код попадает в токен.
+# Вытесняются только листья, поэтому у оставшихся фраз всегда есть все префиксы
+class PhraseLRU:
+    def __init__(self):
+        # Код фразы -> код родителя (фразы без последнего байта)
+        self.parents = {}
+        # Код фразы -> количество продолжений в словаре
+        self.child_counts = {}
+        # Фразы-листья от давно использованных к недавно использованным
+        self.leaves = OrderedDict()
+
+    def touch(self, code: int):
+        if code in self.leaves:
+            self.leaves.move_to_end(code)
+
+    def add(self, code: int, parent: int):
+        self.parents[code] = parent
+        self.child_counts[code] = 0
+        self.leaves[code] = None
+        if parent:
+            # У родителя появилось продолжение - он больше не лист
+            self.child_counts[parent] += 1
+            self.leaves.pop(parent, None)
+
+    def evict(self, keep: int):
+        # Удаляет давно не использованный лист, кроме keep (родителя добавляемой фразы).
+        # Возвращает освободившийся код или None, если вытеснить нечего
+        for code in self.leaves:
+            if code != keep:
+                break
+        else:
+            return None
+        del self.leaves[code]
+        del self.child_counts[code]
+        parent = self.parents.pop(code)
+        if parent:
+            self.child_counts[parent] -= 1
+            if self.child_counts[parent] == 0:
+                self.leaves[parent] = None
+        return code
+
+
+def resolve_policy(policy: str) -> int:
+    # Код политики заполненного словаря для заголовка
+    if policy not in LZ78_POLICIES:
+        raise ValueError(f"Unknown dictionary policy: {policy}")
+    return LZ78_POLICIES[policy]
+
+
 # Класс для кодирования данных по алгоритму LZ78
 class LZ78Encoder:
-    def __init__(self):
-        # Инициализация словаря с пустой строкой (код 0)
-        self.dictionary = {b'': 0}
+    def __init__(self, capacity: int = None, policy: str = "reset"):
+        # Словарь хранится как префиксное дерево: фраза - это узел с целым кодом (пустая строка - код 0),
+        # а переход по байту хранится под ключом (код родителя << 8) | байт.
+        # Шаг кодирования - один поиск по целому ключу, без построения новых строк
+        self.children = {}
         # Следующий доступный код для добавления в словарь
         self.next_code = 1
+        # Емкость словаря вместе с пустой строкой (None - без ограничения) и политика при заполнении
+        self.capacity = capacity
+        self.policy = resolve_policy(policy)
+        # Для политики lru: ключ перехода каждого кода (чтобы удалить его при вытеснении)
+        self.lru = PhraseLRU() if self.policy == LZ78_POLICIES["lru"] else None
+        self.keys = [0]
 
     def encode(self, data: bytes) -> list:
         # Результат кодирования - список кортежей (код, байт)
-        encoded_data = []
-        # Текущая накапливаемая строка для поиска в словаре
-        current_string = b''
+        return [(code, byte) for code, byte, _ in self.tokens(data)]
+
+    def tokens(self, data: bytes):
+        # Генератор токенов (код, байт, количество кодов в словаре перед токеном) по мере кодирования.
+        # Количество кодов определяет ширину кода токена; декодировщик знает его из своего словаря
+        children = self.children
+        next_code = self.next_code
+        capacity = self.capacity or float("inf")
+        policy = self.policy
+        lru = self.lru
+        keys = self.keys
+        # Код текущей накапливаемой фразы (0 - пустая строка)
+        node = 0
 
         # Обрабатываем каждый байт входных данных
         for byte in data:
-            # Формируем новую строку путем добавления текущего байта
-            new_string = current_string + bytes([byte])
-
-            # Если новая строка есть в словаре, продолжаем накапливать
-            if new_string in self.dictionary:
-                current_string = new_string
-            else:
-                # Добавляем в выходные данные пару (код, байт)
-                encoded_data.append((self.dictionary[current_string], byte))
-                # Добавляем новую строку в словарь
-                self.dictionary[new_string] = self.next_code
-                self.next_code += 1
-                # Сбрасываем текущую строку
-                current_string = b''
-
-        # Обработка оставшейся строки (если есть)
-        if current_string:
-            # Используем специальный маркер 256 для конца данных
-            encoded_data.append((self.dictionary[current_string], 256))
+            # Ищем продолжение текущей фразы этим байтом
+            key = (node << 8) | byte
+            child = children.get(key)
 
-        return encoded_data
+            # Если такая фраза есть в словаре, продолжаем накапливать
+            if child is not None:
+                node = child
+                continue
+
+            # Выдаем пару (код, байт)
+            yield node, byte, next_code
+            if lru is not None and node:
+                lru.touch(node)
+
+            # Добавляем новую фразу в словарь, если есть место, иначе действуем по политике
+            if next_code < capacity:
+                children[key] = next_code
+                if lru is not None:
+                    keys.append(key)
+                    lru.add(next_code, node)
+                next_code += 1
+            elif policy == LZ78_POLICIES["reset"]:
+                children.clear()
+                next_code = 1
+            elif lru is not None:
+                code = lru.evict(node)
+                if code is not None:
+                    del children[keys[code]]
+                    children[key] = code
+                    keys[code] = key
+                    lru.add(code, node)
+
+            # Сбрасываем текущую фразу
+            node = 0
+
+        self.next_code = next_code
+
+        # Обработка оставшейся фразы (если есть)
+        if node:
+            # Используем специальный маркер 256 для конца данных
+            yield node, 256, next_code
 
 
 # Класс для декодирования данных по алгоритму LZ78
 class LZ78Decoder:
-    def __init__(self):
-        # Инициализация словаря с пустой строкой (код 0)
-        self.dictionary = {0: b''}
+    def __init__(self, capacity: int = None, policy: str = "reset"):
+        # Фраза с кодом c не хранится отдельно: это участок уже восстановленных данных
+        # output[starts[c]:starts[c] + lengths[c]] (место ее первого появления).
+        # На код приходится 16 байт вместо копии всей фразы; код 0 - пустая строка
+        self.starts = array('q', [0])
+        self.lengths = array('q', [0])
+        # Восстановленные данные (фразы ссылаются на них)
+        self.output = bytearray()
+        # Емкость и политика словаря - те же, что у кодировщика
+        self.capacity = capacity
+        self.policy = resolve_policy(policy)
+        self.lru = PhraseLRU() if self.policy == LZ78_POLICIES["lru"] else None
 
     def decode(self, encoded_data: list) -> bytes:
-        # Результат декодирования
-        decoded_data = []
+        starts = self.starts
+        lengths = self.lengths
+        decoded_data = self.output
+        capacity = self.capacity or float("inf")
+        policy = self.policy
+        lru = self.lru
+        # Начало результата этого вызова
+        begin = len(decoded_data)
 
         # Обрабатываем каждый элемент закодированных данных
         for code, byte in encoded_data:
             # Проверка на валидность кода
-            if code not in self.dictionary:
+            if code >= len(starts):
                 raise ValueError(f"Invalid code {code} in encoded data")
 
-            # Если встретили маркер конца данных
+            # Копируем фразу из места ее первого появления
+            position = len(decoded_data)
+            start = starts[code]
+            length = lengths[code]
+            decoded_data += decoded_data[start:start + length]
+
+            # Если встретили маркер конца данных, новой фразы нет
             if byte == 256:
-                entry = self.dictionary[code]
-            else:
-                # Формируем новую строку из словаря + новый байт
-                entry = self.dictionary[code] + bytes([byte])
-                # Добавляем в словарь только если это не последняя запись
-                if byte != 256:
-                    self.dictionary[len(self.dictionary)] = entry
+                continue
 
-            # Добавляем декодированную строку в результат
-            decoded_data.append(entry)
+            # Новая фраза - фраза code и байт - начинается в position
+            decoded_data.append(byte)
+            if lru is not None and code:
+                lru.touch(code)
 
-        # Объединяем все части в единый bytes объект
-        return b''.join(decoded_data)
+            # Словарь меняется так же, как в кодировщике
+            if len(starts) < capacity:
+                if lru is not None:
+                    lru.add(len(starts), code)
+                starts.append(position)
+                lengths.append(length + 1)
+            elif policy == LZ78_POLICIES["reset"]:
+                del starts[1:]
+                del lengths[1:]
+            elif lru is not None:
+                new_code = lru.evict(code)
+                if new_code is not None:
+                    starts[new_code] = position
+                    lengths[new_code] = length + 1
+                    lru.add(new_code, code)
+
+        return bytes(decoded_data[begin:])
 
 
 # Функция для сжатия данных с использованием LZ78
-def compress_lz78(data: bytes) -> bytes:
-    # Создаем кодировщик
-    encoder = LZ78Encoder()
-    # Получаем закодированные данные в виде списка пар (код, байт)
-    encoded_data = encoder.encode(data)
-
-    # Определяем необходимый размер в байтах для хранения кодов
-    max_code = max((code for code, _ in encoded_data), default=0)
-    # Вычисляем минимальное количество байт для хранения максимального кода
-    code_bytes = (max_code.bit_length() + 7) // 8
-    # Гарантируем минимум 1 байт
-    code_bytes = max(1, code_bytes)
-
-    # Подготавливаем выходные сжатые данные
-    compressed_data = bytearray()
-    for code, byte in encoded_data:
-        # Добавляем код в нужном количестве байт
-        compressed_data.extend(code.to_bytes(code_bytes, 'big'))
-        # Обработка специального маркера конца (256)
+def compress_lz78(data: bytes, capacity: int = LZ78_DEFAULT_CAPACITY, policy: str = "reset") -> bytes:
+    # Создаем кодировщик с ограниченным словарем (capacity - количество кодов, None - без ограничения)
+    encoder = LZ78Encoder(capacity, policy)
+    writer = BitWriter()
+
+    # Токены пишутся сразу по мере кодирования. Код занимает столько бит, сколько нужно для
+    # наибольшего кода словаря на этот момент, поэтому ширина растет вместе со словарем.
+    # Последний токен (маркер 256) пишется без байта: конец данных определяется по исходной длине
+    for code, byte, code_count in encoder.tokens(data):
+        width = (code_count - 1).bit_length()
         if byte == 256:
-            compressed_data.extend((255, 255))  # Используем 255,255 для представления 256
+            writer.write(code, width)
         else:
-            compressed_data.append(byte)
+            writer.write((code << 8) | byte, width + 8)
+
+    # Заголовок: 0 на месте размера кода, версия формата, политика, емкость словаря (0 - без ограничения)
+    # и исходная длина
+    header = bytes([0, 3, LZ78_POLICIES[policy]]) + encode_varint(capacity or 0) + encode_varint(len(data))
+    return header + writer.getvalue()
+
 
-    # Добавляем заголовок (размер кода и версию формата)
-    header = bytes([code_bytes, 1])  # Версия 1
-    return header + compressed_data
+def read_tokens(reader: BitReader, decoder, original_length: int):
+    # Генератор токенов формата версии 3. Ширина кода и конец данных зависят от состояния декодировщика,
+    # поэтому токены читаются по одному, пока декодировщик обрабатывает предыдущие
+    starts = decoder.starts
+    lengths = decoder.lengths
+    output = decoder.output
+    while len(output) < original_length:
+        code = reader.read((len(starts) - 1).bit_length())
+        if code >= len(starts):
+            raise ValueError(f"Invalid code {code} in encoded data")
+        end = len(output) + lengths[code]
+        if end >= original_length:
+            if end > original_length:
+                raise ValueError("LZ78 phrase runs past the end of data")
+            # Последний токен - без байта
+            yield code, 256
+            return
+        yield code, reader.read(8)
 
 
 # Функция для распаковки данных, сжатых LZ78
@@ -108,13 +255,32 @@ def decompress_lz78(compressed_data: bytes) -> bytes:
 
     # Чтение заголовка (первый байт - размер кода, второй - версия)
     code_bytes, version = compressed_data[:2]
+    pos = 2  # Позиция после заголовка
     # Проверка версии формата
-    if version != 1:
+    if version == 1:
+        # Версия 1 - словарь без ограничения
+        capacity, policy = None, "reset"
+    elif version in (2, 3):
+        # Версии 2 и 3 - политика и емкость словаря
+        policy_names = {value: name for name, value in LZ78_POLICIES.items()}
+        if len(compressed_data) < 3 or compressed_data[2] not in policy_names:
+            raise ValueError("Unknown dictionary policy")
+        policy = policy_names[compressed_data[2]]
+        capacity, pos = decode_varint(compressed_data, 3)
+        capacity = capacity or None
+    else:
         raise ValueError("Unsupported compression version")
 
+    # Создаем декодер
+    decoder = LZ78Decoder(capacity, policy)
+
+    if version == 3:
+        # Версия 3 - исходная длина и битовый поток кодов переменной ширины
+        original_length, pos = decode_varint(compressed_data, pos)
+        return decoder.decode(read_tokens(BitReader(compressed_data, pos), decoder, original_length))
+
     # Подготовка списка закодированных данных для декодера
     encoded_data = []
-    pos = 2  # Позиция после заголовка
 
     # Обработка сжатых данных
     while pos + code_bytes <= len(compressed_data):
@@ -130,14 +296,14 @@ def decompress_lz78(compressed_data: bytes) -> bytes:
         byte = compressed_data[pos]
         pos += 1
 
-        # Обработка специальной последовательности 255,255 (представляющей 256)
-        if byte == 255 and pos < len(compressed_data) and compressed_data[pos] == 255:
+        # Обработка специальной последовательности 255,255 (представляющей 256).
+        # Маркер конца стоит только в самом конце данных, иначе это байт 255 и начало следующего кода
+        if byte == 255 and pos == len(compressed_data) - 1 and compressed_data[pos] == 255:
             byte = 256
             pos += 1
 
         # Добавление пары (код, байт) в список
         encoded_data.append((code, byte))
 
-    # Создаем декодер и выполняем декодирование
-    decoder = LZ78Decoder()
-    return decoder.decode(encoded_data)
\ No newline at end of file
+    # Выполняем декодирование
+    return decoder.decode(encoded_data)
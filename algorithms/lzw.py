@@ -0,0 +1,189 @@
+from array import array
+
+from algorithms.bitio import BitReader, BitWriter
+from algorithms.varint import decode_varint, encode_varint
+
+# Коды 0..255 - однобайтовые фразы, новые фразы получают коды начиная с FIRST_CODE
+FIRST_CODE = 256
+# Политики заполненного словаря (значение - код политики в заголовке):
+# reset - словарь очищается до однобайтовых фраз, freeze - словарь больше не меняется
+LZW_POLICIES = {"reset": 0, "freeze": 1}
+# Емкость словаря по умолчанию (вместе с однобайтовыми фразами)
+LZW_DEFAULT_CAPACITY = 1 << 16
+# Версия формата
+LZW_FORMAT_VERSION = 1
+
+
+def resolve_lzw_options(capacity: int | None, policy: str) -> int:
+    # Проверяет емкость словаря и возвращает код политики для заголовка (None - словарь без ограничения)
+    if capacity is not None and capacity <= FIRST_CODE:
+        raise ValueError("LZW dictionary capacity must exceed 256 codes")
+    if policy not in LZW_POLICIES:
+        raise ValueError(f"Unknown dictionary policy: {policy}")
+    return LZW_POLICIES[policy]
+
+
+# Класс для кодирования данных по алгоритму LZW
+class LZWEncoder:
+    def __init__(self, capacity: int | None = LZW_DEFAULT_CAPACITY, policy: str = "reset"):
+        # Словарь - префиксное дерево, как в LZ78Encoder: переход из фразы с кодом c по байту
+        # хранится под ключом (c << 8) | байт; однобайтовые фразы заданы неявно своими кодами
+        self.children = {}
+        # Следующий доступный код для добавления в словарь
+        self.next_code = FIRST_CODE
+        self.capacity = capacity
+        self.policy = resolve_lzw_options(capacity, policy)
+
+    def tokens(self, data: bytes):
+        # Генератор пар (код, количество кодов в словаре перед выдачей кода) по мере кодирования.
+        # В отличие от LZ78, байт после фразы не выдается: он начинает следующую фразу
+        if not data:
+            return
+        children = self.children
+        next_code = self.next_code
+        capacity = self.capacity or float("inf")
+        reset = self.policy == LZW_POLICIES["reset"]
+
+        symbols = iter(data)
+        # Код текущей фразы (начинается с первого байта)
+        node = next(symbols)
+
+        for byte in symbols:
+            key = (node << 8) | byte
+            child = children.get(key)
+
+            # Если фраза продолжается, накапливаем дальше
+            if child is not None:
+                node = child
+                continue
+
+            # Выдаем код фразы и добавляем ее продолжение в словарь (или действуем по политике)
+            yield node, next_code
+            if next_code < capacity:
+                children[key] = next_code
+                next_code += 1
+            elif reset:
+                children.clear()
+                next_code = FIRST_CODE
+
+            # Новая фраза начинается с текущего байта
+            node = byte
+
+        self.next_code = next_code
+        # Последняя фраза
+        yield node, next_code
+
+
+# Класс для декодирования данных по алгоритму LZW
+class LZWDecoder:
+    def __init__(self, capacity: int | None = LZW_DEFAULT_CAPACITY, policy: str = "reset"):
+        # Фраза с кодом FIRST_CODE + i - участок восстановленных данных
+        # output[starts[i]:starts[i] + lengths[i]], как в LZ78Decoder
+        self.starts = array('q')
+        self.lengths = array('q')
+        self.output = bytearray()
+        # Счетчик кодов, повторяющий next_code кодировщика в момент выдачи очередного кода
+        self.next_code = FIRST_CODE
+        self.capacity = capacity
+        self.policy = resolve_lzw_options(capacity, policy)
+        # Предыдущая фраза: ее продолжение первым байтом текущей фразы - ожидающая запись словаря.
+        # Хранится между вызовами decode, поэтому поток кодов можно подавать частями
+        self.previous_start = 0
+        self.previous_length = 0
+        self.pending = False
+
+    def decode(self, codes) -> bytes:
+        starts = self.starts
+        lengths = self.lengths
+        decoded_data = self.output
+        capacity = self.capacity or float("inf")
+        reset = self.policy == LZW_POLICIES["reset"]
+        previous_start = self.previous_start
+        previous_length = self.previous_length
+        pending = self.pending
+        # Начало результата этого вызова
+        begin = len(decoded_data)
+
+        for code in codes:
+            position = len(decoded_data)
+            if code < FIRST_CODE:
+                # Однобайтовая фраза
+                decoded_data.append(code)
+                length = 1
+            elif code - FIRST_CODE < len(starts):
+                # Известная фраза - копируем из места ее первого появления
+                start = starts[code - FIRST_CODE]
+                length = lengths[code - FIRST_CODE]
+                decoded_data += decoded_data[start:start + length]
+            elif pending and code - FIRST_CODE == len(starts):
+                # Код ожидающей записи: предыдущая фраза и ее же первый байт
+                length = previous_length + 1
+                decoded_data += decoded_data[previous_start:previous_start + previous_length]
+                decoded_data.append(decoded_data[previous_start])
+            else:
+                raise ValueError(f"Invalid code {code} in encoded data")
+
+            # Ожидающая запись - предыдущая фраза и первый байт текущей; она начинается там же, где предыдущая
+            if pending:
+                starts.append(previous_start)
+                lengths.append(previous_length + 1)
+
+            # Повторяем действие кодировщика после выдачи этого кода
+            if self.next_code < capacity:
+                self.next_code += 1
+                pending = True
+            elif reset:
+                del starts[:]
+                del lengths[:]
+                self.next_code = FIRST_CODE
+                pending = False
+            else:
+                pending = False
+
+            previous_start, previous_length = position, length
+
+        self.previous_start = previous_start
+        self.previous_length = previous_length
+        self.pending = pending
+        return bytes(decoded_data[begin:])
+
+
+# Функция для сжатия данных с использованием LZW
+def compress_lzw(data: bytes, capacity: int | None = LZW_DEFAULT_CAPACITY, policy: str = "reset") -> bytes:
+    # capacity - количество кодов в словаре, None - без ограничения
+    encoder = LZWEncoder(capacity, policy)
+    writer = BitWriter()
+
+    # Код занимает столько бит, сколько нужно для наибольшего кода словаря на момент выдачи
+    for code, code_count in encoder.tokens(data):
+        writer.write(code, (code_count - 1).bit_length())
+
+    # Заголовок: версия, политика, емкость словаря (0 - без ограничения) и исходная длина
+    header = bytes([LZW_FORMAT_VERSION, LZW_POLICIES[policy]]) + encode_varint(capacity or 0) + encode_varint(len(data))
+    return header + writer.getvalue()
+
+
+def read_codes(reader: BitReader, decoder: LZWDecoder, original_length: int):
+    # Генератор кодов: ширина кода зависит от счетчика декодировщика, поэтому коды читаются
+    # по одному, пока декодировщик обрабатывает предыдущие
+    while len(decoder.output) < original_length:
+        yield reader.read((decoder.next_code - 1).bit_length())
+
+
+# Функция для распаковки данных, сжатых LZW
+def decompress_lzw(compressed_data: bytes) -> bytes:
+    # Чтение заголовка
+    if len(compressed_data) < 2 or compressed_data[0] != LZW_FORMAT_VERSION:
+        raise ValueError("Unsupported compression version")
+    policy_names = {value: name for name, value in LZW_POLICIES.items()}
+    if compressed_data[1] not in policy_names:
+        raise ValueError("Unknown dictionary policy")
+    capacity, pos = decode_varint(compressed_data, 2)
+    capacity = capacity or None
+    original_length, pos = decode_varint(compressed_data, pos)
+
+    decoder = LZWDecoder(capacity, policy_names[compressed_data[1]])
+    decoded_data = decoder.decode(read_codes(BitReader(compressed_data, pos), decoder, original_length))
+    if len(decoded_data) != original_length:
+        raise ValueError("Decoded LZW data length does not match the header")
+    return decoded_data
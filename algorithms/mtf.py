@@ -1,34 +1,34 @@
 def mtf_transform(data: bytes) -> bytes:
-    # Инициализируем алфавит - список чисел от 0 до 255 (все возможные байты)
-    alphabet = list(range(256))
-    transformed_data = bytearray()  # Буфер для преобразованных данных
+    # Алфавит - bytearray из 256 байт: поиск и сдвиг выполняются на уровне C, а не поэлементно
+    alphabet = bytearray(range(256))
+    # Буфер заполнен нулями, поэтому ранг 0 (самый частый после BWT) записывать не нужно
+    transformed_data = bytearray(len(data))
+    find = alphabet.index
 
-    for byte in data:  # Обрабатываем каждый байт входных данных
+    for position, byte in enumerate(data):  # Обрабатываем каждый байт входных данных
         # Находим индекс текущего байта в алфавите
-        index = alphabet.index(byte)
-        # Добавляем индекс в выходные данные
-        transformed_data.append(index)
-        # Удаляем этот байт из текущей позиции в алфавите
-        alphabet.pop(index)
-        # Вставляем этот байт в начало алфавита
-        alphabet.insert(0, byte)
+        index = find(byte)
+        if index:
+            transformed_data[position] = index
+            # Сдвигаем первые index байт на одну позицию вправо и ставим байт в начало
+            alphabet[1:index + 1] = alphabet[:index]
+            alphabet[0] = byte
 
     return bytes(transformed_data)
 
 
 def mtf_inverse(transformed_data: bytes) -> bytes:
     # Инициализируем такой же алфавит
-    alphabet = list(range(256))
-    original_data = bytearray()  # Буфер для восстановленных данных
+    alphabet = bytearray(range(256))
+    original_data = bytearray(len(transformed_data))  # Буфер для восстановленных данных
 
-    for index in transformed_data:  # Обрабатываем каждый индекс
+    for position, index in enumerate(transformed_data):  # Обрабатываем каждый индекс
         # Получаем байт по индексу из алфавита
         byte = alphabet[index]
-        # Добавляем байт в выход
-        original_data.append(byte)
-        # Удаляем этот байт из текущей позиции
-        alphabet.pop(index)
-        # Вставляем его в начало алфавита
-        alphabet.insert(0, byte)
+        original_data[position] = byte
+        if index:
+            # Переносим байт в начало алфавита одним сдвигом среза
+            alphabet[1:index + 1] = alphabet[:index]
+            alphabet[0] = byte
 
-    return bytes(original_data)
\ No newline at end of file
+    return bytes(original_data)
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+def resolve_workers(workers: int | None) -> int:
+    """
+    Определяет количество процессов для параллельного режима.
+    :param workers: Запрошенное количество процессов (None - по числу ядер).
+    :return: Количество процессов (1 означает последовательный режим).
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def split_aligned(total: int, unit: int, parts: int) -> list[tuple[int, int]]:
+    """
+    Делит диапазон [0, total) на не более чем parts отрезков, границы которых кратны unit.
+    :param total: Длина данных.
+    :param unit: Шаг выравнивания границ (например, размер чанка).
+    :param parts: Желаемое количество отрезков.
+    :return: Список пар (начало, конец).
+    """
+    units = (total + unit - 1) // unit  # Количество целых единиц (последняя может быть неполной)
+    units_per_part = max(1, (units + parts - 1) // parts)
+    step = units_per_part * unit
+    return [(start, min(start + step, total)) for start in range(0, total, step)]
+
+
+def run_in_pool(worker, data: bytes, tasks: list[tuple], workers: int, output_size: int = 0) -> tuple[list, bytes]:
+    """
+    Выполняет worker(input_name, output_name, *task) для каждой задачи в пуле процессов.
+    Входные данные и выходной буфер передаются через разделяемую память, а не копируются
+    в каждую задачу через pickle; результаты возвращаются в порядке задач.
+    :param worker: Функция верхнего уровня модуля (должна импортироваться дочерним процессом).
+    :param data: Входные данные.
+    :param tasks: Аргументы задач.
+    :param workers: Количество процессов.
+    :param output_size: Размер общего выходного буфера в байтах.
+    :return: Список результатов задач и содержимое выходного буфера.
+    """
+    source = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    target = shared_memory.SharedMemory(create=True, size=max(1, output_size))
+    try:
+        source.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker, source.name, target.name, *task) for task in tasks]
+            results = [future.result() for future in futures]
+        output = bytes(target.buf[:output_size])
+    finally:
+        # Освобождаем сегменты даже при ошибке в задаче
+        for segment in (source, target):
+            segment.close()
+            segment.unlink()
+    return results, output
+
+
+def read_shared(name: str, start: int, end: int) -> bytes:
+    """
+    Читает отрезок [start, end) из сегмента разделяемой памяти (вызывается в дочернем процессе).
+    :param name: Имя сегмента.
+    :return: Копия отрезка.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(segment.buf[start:end])
+    finally:
+        segment.close()
+
+
+def write_shared(name: str, start: int, payload: bytes):
+    """
+    Записывает payload в сегмент разделяемой памяти начиная с позиции start.
+    :param name: Имя сегмента.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        segment.buf[start:start + len(payload)] = payload
+    finally:
+        segment.close()
@@ -1,39 +1,56 @@
+import numpy as np
+
+# Максимальная длина серии и блока неповторяющихся байтов (счетчик занимает один байт)
+MAX_COUNT = 255
+# Счетчики для блока неповторяющихся байтов при распаковке (каждый байт повторяется 1 раз)
+LITERAL_COUNTS = bytes([1]) * MAX_COUNT
+
+
 def rle_compress(data: bytes) -> bytes:
     """Сжимает данные с использованием RLE."""
-    compressed_data = bytearray()  # Создаем пустой массив для сжатых данных
     n = len(data)  # Получаем длину исходных данных
-    i = 0  # Указатель на текущую позицию в исходных данных
-
-    while i < n:  # Пока не обработали все данные
-        current_byte = data[i]  # Берем текущий байт
-        count = 1  # Счетчик повторений (минимум 1)
-
-        # Ищем количество повторений текущего байта (максимум 255)
-        while i + count < n and count < 255 and data[i + count] == current_byte:
-            count += 1
-
-        if count > 1:  # Если нашли повторения (2 и более)
-            compressed_data.append(count)  # Добавляем счетчик
-            compressed_data.append(current_byte)  # Добавляем сам байт
-            i += count  # Перемещаем указатель вперед на count позиций
-        else:  # Если повторений нет
-            non_repeating = bytearray()  # Буфер для неповторяющихся байтов
-            # Собираем последовательность неповторяющихся байтов
-            while i < n and (i + 1 >= n or data[i] != data[i + 1]):
-                non_repeating.append(data[i])
-                i += 1
-                if len(non_repeating) == 255:  # Максимальная длина блока - 255
-                    break
-            # Добавляем маркер неповторяющейся последовательности (0)
-            compressed_data.append(0)
-            # Добавляем длину последовательности
-            compressed_data.append(len(non_repeating))
-            # Добавляем саму последовательность
-            compressed_data.extend(non_repeating)
+    if n == 0:
+        return b''
+
+    # Находим границы серий одинаковых байтов одним векторным проходом
+    values = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, n))
+
+    # Серия режется на куски по 255; одиночный остаток (длина % 255 == 1) уходит
+    # в блок неповторяющихся байтов, остальное кодируется парами (счетчик, байт)
+    bodies = lengths - (lengths % MAX_COUNT == 1)
+    repeated = np.flatnonzero(bodies > 0)
+
+    compressed_data = bytearray()  # Создаем пустой массив для сжатых данных
+    position = 0  # Начало еще не закодированных данных
+    for start, body in zip(starts[repeated].tolist(), bodies[repeated].tolist()):
+        # Все байты между сериями - неповторяющиеся
+        append_literals(compressed_data, data, position, start)
+        byte = data[start]
+        full, rest = divmod(body, MAX_COUNT)
+        compressed_data += bytes((MAX_COUNT, byte)) * full  # Полные серии по 255
+        if rest:
+            compressed_data += bytes((rest, byte))
+        position = start + body
+
+    append_literals(compressed_data, data, position, n)
+    return bytes(compressed_data)
+
+
+def append_literals(compressed_data: bytearray, data: bytes, start: int, end: int):
+    # Блоки неповторяющихся байтов: маркер 0, длина (до 255) и сами байты
+    for block_start in range(start, end, MAX_COUNT):
+        block = data[block_start:min(block_start + MAX_COUNT, end)]
+        compressed_data.append(0)
+        compressed_data.append(len(block))
+        compressed_data += block
+
 
 def rle_decompress(compressed_data: bytes) -> bytes:
     """Декомпрессия RLE."""
-    decompressed_data = bytearray()  # Буфер для распакованных данных
+    values = bytearray()  # Байты для повторения
+    counts = bytearray()  # Сколько раз повторить каждый байт
     n = len(compressed_data)  # Длина сжатых данных
     i = 0  # Указатель на текущую позицию в сжатых данных
 
@@ -41,11 +58,13 @@ def rle_decompress(compressed_data: bytes) -> bytes:
         flag = compressed_data[i]  # Читаем флаг/счетчик
         if flag == 0:  # Если это маркер неповторяющейся последовательности
             length = compressed_data[i + 1]  # Читаем длину последовательности
-            # Копируем последовательность в выходной буфер
-            decompressed_data.extend(compressed_data[i + 2:i + 2 + length])
+            values += compressed_data[i + 2:i + 2 + length]
+            counts += LITERAL_COUNTS[:length]
             i += 2 + length  # Перемещаем указатель
         else:  # Если это счетчик повторений
-            count = flag  # Количество повторений
-            byte = compressed_data[i + 1]  # Байт для повторения
-            decompressed_data.extend([byte] * count)  # Добавляем count раз byte
-            i += 2  # Перемещаем указатель на следующую пару
\ No newline at end of file
+            values.append(compressed_data[i + 1])
+            counts.append(flag)
+            i += 2  # Перемещаем указатель на следующую пару
+
+    # Разворачиваем все серии сразу в выходной буфер итогового размера
+    return np.repeat(np.frombuffer(values, dtype=np.uint8), np.frombuffer(counts, dtype=np.uint8)).tobytes()
@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def sort_rotations(symbols: np.ndarray, max_depth: int = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Сортирует все циклические сдвиги последовательности методом удвоения префиксов.
+    На каждом шаге сдвиг i описывается парой (ранг первых k символов, ранг следующих k символов),
+    поэтому хватает O(log n) векторных сортировок и O(n) памяти вместо O(n^2) на список сдвигов.
+    :param symbols: Последовательность символов (массив целых чисел).
+    :param max_depth: Сколько первых символов сдвигов достаточно сравнить (None - сдвиги целиком).
+                      Сдвиги, совпадающие на этой глубине, остаются в порядке возрастания позиции.
+    :return: Порядок сдвигов (order[j] - начало j-го по порядку сдвига)
+             и ранги сдвигов (равные сдвиги получают одинаковый ранг).
+    """
+    n = len(symbols)
+    # Ранги и порядок помещаются в int32 - вдвое меньше памяти на каждом шаге
+    index_type = np.int32 if n < 1 << 31 else np.int64
+    rank = symbols.astype(index_type)  # Ранги по первому символу
+    order = np.argsort(rank, kind="stable").astype(index_type)
+    depth = 1  # Сколько первых символов сдвига учтено в ранге
+
+    while depth < n and (max_depth is None or depth < max_depth):
+        # Ключ сдвига i - пара рангов (i, i + depth), упакованная в одно число.
+        # Собирается на месте, без отдельного массива сдвинутых рангов
+        key = rank.astype(np.int64)
+        key *= int(rank.max()) + 1
+        key[:-depth] += rank[depth:]
+        key[-depth:] += rank[:depth]
+        order = None  # Прежний порядок не нужен - освобождаем его до сортировки
+        order = np.argsort(key, kind="stable").astype(index_type)
+
+        # Границы групп одинаковых ключей в отсортированном порядке; ключи больше не нужны
+        sorted_key = key[order]
+        del key
+        boundaries = sorted_key[1:] != sorted_key[:-1]
+        del sorted_key
+
+        # Новые ранги: номер группы одинаковых ключей в отсортированном порядке
+        rank = np.empty(n, dtype=index_type)
+        rank[order[0]] = 0
+        rank[order[1:]] = np.cumsum(boundaries, dtype=index_type)
+        del boundaries
+        depth *= 2
+
+        # Все сдвиги различимы - дальше сравнивать не нужно
+        if rank[order[-1]] == n - 1:
+            break
+
+    return order, rank
+
+
+def suffix_array(data: bytes, max_depth: int = None) -> np.ndarray:
+    """
+    Строит суффиксный массив: начала суффиксов data в лексикографическом порядке.
+    Суффиксы сортируются как циклические сдвиги строки с добавленным в конец
+    уникальным наименьшим символом-ограничителем.
+    :param data: Исходные данные.
+    :param max_depth: Глубина сравнения суффиксов (см. sort_rotations).
+    :return: Массив позиций (int32, для данных от 2^31 байт - int64).
+    """
+    symbols = np.zeros(len(data) + 1, dtype=np.int16)
+    symbols[:-1] = np.frombuffer(data, dtype=np.uint8)
+    symbols[:-1] += 1  # 0 - ограничитель
+    order, _ = sort_rotations(symbols, max_depth)
+    return order[1:]  # Первым всегда идет суффикс из одного ограничителя
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Кодирует неотрицательное целое число в формате varint (LEB128):
+    по 7 бит на байт, старший бит байта означает, что число продолжается.
+    :param value: Неотрицательное целое число.
+    :return: Закодированные байты.
+    """
+    if value < 0:
+        raise ValueError("varint encodes only non-negative integers")
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)  # Младшие 7 бит и флаг продолжения
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varint(data: bytes, pos: int = 0) -> tuple[int, int]:
+    """
+    Декодирует число в формате varint.
+    :param data: Байтовая строка.
+    :param pos: Позиция начала числа.
+    :return: Число и позиция сразу после него.
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:  # Флаг продолжения сброшен - число закончилось
+            return value, pos
+        shift += 7
+
+
+def read_varint(stream) -> int:
+    """
+    Читает число в формате varint из файлового объекта.
+    :param stream: Файл, открытый в двоичном режиме.
+    :return: Число.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise ValueError("Truncated varint")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """
+    Векторно кодирует массив неотрицательных чисел (меньше 2^63) в varint подряд.
+    :param values: Массив целых чисел.
+    :return: Закодированные байты (то же, что склейка encode_varint по каждому числу).
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b''
+
+    # Количество байт каждого числа: по одному на каждые начатые 7 бит
+    sizes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        sizes += values >= (np.uint64(1) << np.uint64(shift))
+    offsets = np.cumsum(sizes) - sizes  # Позиция первого байта каждого числа
+
+    encoded = np.empty(int(offsets[-1] + sizes[-1]), dtype=np.uint8)
+    for byte_index in range(int(sizes.max())):
+        # Заполняем byte_index-й байт у всех чисел, в которых он есть
+        mask = sizes > byte_index
+        chunk = (values[mask] >> np.uint64(7 * byte_index)) & np.uint64(0x7F)
+        more = (sizes[mask] > byte_index + 1).astype(np.uint64) << np.uint64(7)
+        encoded[offsets[mask] + byte_index] = chunk | more
+    return encoded.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """
+    Векторно декодирует последовательность varint, записанных подряд.
+    :param data: Байтовая строка, целиком состоящая из varint.
+    :return: Массив чисел (uint64).
+    """
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    if len(encoded) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    if encoded[-1] & 0x80:
+        raise ValueError("Truncated varint")
+
+    # Последний байт числа - байт без флага продолжения
+    ends = np.flatnonzero(encoded < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Номер байта внутри своего числа задает его сдвиг
+    value_ids = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    shifts = (np.arange(len(encoded)) - starts[value_ids]) * 7
+    if shifts.max() >= 64:
+        raise ValueError("Varint is too long")
+    parts = (encoded & 0x7F).astype(np.uint64) << shifts.astype(np.uint64)
+    return np.add.reduceat(parts, starts)
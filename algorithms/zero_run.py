@@ -0,0 +1,98 @@
+import re
+
+# Цифры длины серии нулей в биективной двоичной системе (младшая цифра первой)
+RUNA = 0  # Цифра 1
+RUNB = 1  # Цифра 2
+# Ненулевые ранги 1..253 сдвигаются на 1, ранги 254 и 255 кодируются парой (ESCAPE, ранг)
+ESCAPE = 255
+
+ZERO_RUN = re.compile(b"\x00+")
+DIGIT_RUN = re.compile(b"[\x00\x01]+")
+SHIFT_UP = bytes([0] + [value + 1 for value in range(1, 254)] + [254, 255])
+SHIFT_DOWN = bytes([0, 1] + [value - 1 for value in range(2, 255)] + [255])
+
+
+def zero_run_encode(data: bytes) -> bytes:
+    """
+    Кодирует серии нулей (выход MTF) цифрами RUNA/RUNB, как в bzip2.
+    Серия длины n записывается в биективной двоичной системе, поэтому занимает
+    около log2(n) символов вместо n, и энтропийному кодеру достается меньше символов.
+    :param data: Данные после MTF.
+    :return: Закодированные данные (байтовая строка).
+    """
+    encoded = bytearray()
+    position = 0  # Конец последней обработанной серии
+
+    for match in ZERO_RUN.finditer(data):
+        start, end = match.span()
+        encoded += shift_literals(data[position:start])  # Ненулевые ранги до серии
+        encoded += run_digits(end - start)  # Сама серия нулей
+        position = end
+
+    encoded += shift_literals(data[position:])
+    return bytes(encoded)
+
+
+def zero_run_decode(encoded_data: bytes) -> bytes:
+    """
+    Восстанавливает выход MTF из данных, закодированных zero_run_encode.
+    :param encoded_data: Закодированные данные.
+    :return: Восстановленные данные (байтовая строка).
+    """
+    decoded = bytearray()
+    position = 0  # Конец последней обработанной группы цифр
+
+    for match in DIGIT_RUN.finditer(encoded_data):
+        start, end = match.span()
+        decoded += unshift_literals(encoded_data[position:start])
+        # Длина серии: цифра RUNA весит 1, RUNB - 2, вес разряда удваивается
+        length = 0
+        for weight, digit in enumerate(encoded_data[start:end]):
+            length += (digit + 1) << weight
+        decoded += bytes(length)
+        position = end
+
+    decoded += unshift_literals(encoded_data[position:])
+    return bytes(decoded)
+
+
+def run_digits(length: int) -> bytes:
+    digits = bytearray()
+    while length:
+        if length & 1:
+            digits.append(RUNA)
+            length = (length - 1) >> 1
+        else:
+            digits.append(RUNB)
+            length = (length - 2) >> 1
+    return bytes(digits)
+
+
+def shift_literals(segment: bytes) -> bytes:
+    # Быстрый путь: без рангов 254/255 сдвиг делается одной таблицей
+    if b"\xfe" not in segment and b"\xff" not in segment:
+        return segment.translate(SHIFT_UP)
+
+    shifted = bytearray()
+    for value in segment:
+        if value >= 254:
+            shifted.append(ESCAPE)
+        shifted.append(SHIFT_UP[value])
+    return bytes(shifted)
+
+
+def unshift_literals(segment: bytes) -> bytes:
+    if ESCAPE not in segment:
+        return segment.translate(SHIFT_DOWN)
+
+    restored = bytearray()
+    escaped = False  # Предыдущий байт был ESCAPE
+    for value in segment:
+        if escaped:
+            restored.append(value)
+            escaped = False
+        elif value == ESCAPE:
+            escaped = True
+        else:
+            restored.append(SHIFT_DOWN[value])
+    return bytes(restored)
@@ -0,0 +1,39 @@
+from algorithms.bit_rle import bit_rle_compress, bit_rle_decompress
+from file_analysis import analyze_compression
+from png_to_raw import convert_png_to_raw
+import os
+
+
+def compress_file(input_file: str, output_file: str):
+    """Сжимает 1-битное RAW-изображение кодированием серий бит."""
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(input_file, "rb") as f:
+        data = f.read()
+    with open(output_file, "wb") as f:
+        f.write(bit_rle_compress(data))
+
+
+def decompress_file(input_file: str, output_file: str):
+    """Распаковывает 1-битное RAW-изображение."""
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(input_file, "rb") as f:
+        compressed_data = f.read()
+    with open(output_file, "wb") as f:
+        f.write(bit_rle_decompress(compressed_data))
+
+
+if __name__ == "__main__":
+    # Черно-белое изображение в режиме "1" (1 бит на пиксель)
+    bw_png_path = "C:/OPP/compression_project/tests/black_white_image.png"
+    bw_raw_path = "C:/OPP/compression_project/tests/black_white_image_1bit.raw"
+    convert_png_to_raw(bw_png_path, bw_raw_path, mode="1")
+
+    bw_compressed_path = "C:/OPP/compression_project/results/compressed/test4/bw_image_bit_rle_compressed.bin"
+    bw_decompressed_raw_path = "C:/OPP/compression_project/results/decompressors/test4/bw_image_bit_rle_decompressed.raw"
+
+    compress_file(bw_raw_path, bw_compressed_path)
+    decompress_file(bw_compressed_path, bw_decompressed_raw_path)
+
+    # Анализ сжатия
+    print("Черно-белое изображение (1 бит на пиксель):")
+    analyze_compression(bw_raw_path, bw_compressed_path, bw_decompressed_raw_path)
@@ -1,52 +1,57 @@
 from algorithms.huffman import huffman_compress, huffman_decompress
-from algorithms.bwt import bwt_inverse, bwt_transform
+from algorithms.bwt import bwt_inverse, bwt_transform, deserialize_bwt_header, serialize_bwt_header
 from algorithms.mtf import mtf_inverse, mtf_transform
+from algorithms.zero_run import zero_run_decode, zero_run_encode
 from file_analysis import analyze_compression
 
 
-def compress_file(input_path: str, output_path: str):
-    """Сжимает файл с использованием BWT+MTF+HA"""
+def compress_file(input_path: str, output_path: str, chunk_size: int = 1024):
+    """Сжимает файл с использованием BWT+MTF+ZRLE+HA"""
     with open(input_path, "rb") as f:
         data = f.read()
 
     # Применяем BWT (новая версия с чанками)
-    transformed_data, indices = bwt_transform(data)
+    transformed_data, indices = bwt_transform(data, chunk_size)
 
     # Применяем MTF
     mtf_data = mtf_transform(transformed_data)
 
+    # Кодируем серии нулей после MTF, чтобы Хаффману досталось меньше символов
+    zero_run_data = zero_run_encode(mtf_data)
+
     # Применяем Хаффман
-    compressed_bytes = huffman_compress(mtf_data)
+    compressed_bytes = huffman_compress(zero_run_data)
 
     # Сохраняем сжатые данные и дополнительную информацию
     with open(output_path, "wb") as f:
-        # Записываем количество индексов (4 байта)
-        f.write(len(indices).to_bytes(4, byteorder='big'))
-        # Записываем все индексы
-        for index in indices:
-            f.write(index.to_bytes(4, byteorder='big'))
+        # Записываем заголовок BWT (размер чанка, длина, индексы)
+        f.write(serialize_bwt_header(indices, chunk_size, len(data)))
         # Записываем сжатые данные
         f.write(compressed_bytes)
 
 
 def decompress_file(input_path: str, output_path: str):
-    """Распаковывает файл, сжатый с помощью BWT+MTF+HA"""
+    """Распаковывает файл, сжатый с помощью BWT+MTF+ZRLE+HA"""
     with open(input_path, "rb") as f:
-        # Читаем количество индексов
-        num_indices = int.from_bytes(f.read(4), byteorder='big')
-        # Читаем все индексы
-        indices = [int.from_bytes(f.read(4), byteorder='big') for _ in range(num_indices)]
-        # Читаем сжатые данные
-        compressed_data = f.read()
+        data = f.read()
+
+    # Читаем заголовок BWT, остальное - сжатые данные
+    chunk_size, original_length, indices, pos = deserialize_bwt_header(data)
+    compressed_data = data[pos:]
 
     # Декодируем Хаффман
-    decoded_mtf_data = huffman_decompress(compressed_data)
+    decoded_zero_run_data = huffman_decompress(compressed_data)
+
+    # Раскрываем серии нулей
+    decoded_mtf_data = zero_run_decode(decoded_zero_run_data)
 
     # Декодируем MTF
     decoded_transformed_data = mtf_inverse(decoded_mtf_data)
+    if len(decoded_transformed_data) != original_length:
+        raise ValueError("Decoded BWT block length does not match the header")
 
-    # Декодируем BWT (новая версия с чанками)
-    decompressed_data = bwt_inverse(decoded_transformed_data, indices)
+    # Декодируем BWT с размером чанка из заголовка
+    decompressed_data = bwt_inverse(decoded_transformed_data, indices, chunk_size)
 
     # Сохраняем распакованные данные
     with open(output_path, "wb") as f:
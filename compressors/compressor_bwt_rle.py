@@ -1,59 +1,45 @@
-from algorithms.bwt import bwt_transform, bwt_inverse
+from algorithms.bwt import bwt_transform, bwt_inverse, deserialize_bwt_header, serialize_bwt_header
 from algorithms.rle import rle_compress, rle_decompress
+from algorithms.varint import decode_varint, encode_varint
 from file_analysis import analyze_compression
 
 # Размер блока (64 КБ)
 BLOCK_SIZE = 64 * 1024
 
 
-def compress_file(input_path: str, output_path: str):
+def compress_file(input_path: str, output_path: str, chunk_size: int = 1024):
     """Сжимает файл с использованием BWT+RLE."""
     with open(input_path, "rb") as f_in, open(output_path, "wb") as f_out:
-        block_number = 0
         while True:
             block = f_in.read(BLOCK_SIZE)
             if not block:
                 break
-            transformed_data, indices = bwt_transform(block)
-            # Store all indices for the block
-            f_out.write(len(indices).to_bytes(4, 'big'))  # Write number of indices first
-            for index in indices:
-                f_out.write(index.to_bytes(4, 'big'))  # Write each index
+            transformed_data, indices = bwt_transform(block, chunk_size)
+            # Заголовок BWT блока (размер чанка, длина, индексы)
+            f_out.write(serialize_bwt_header(indices, chunk_size, len(block)))
             compressed_data = rle_compress(transformed_data)
-            f_out.write(len(compressed_data).to_bytes(4, 'big'))
+            f_out.write(encode_varint(len(compressed_data)))
             f_out.write(compressed_data)
-            block_number += 1
 
 
 def decompress_file(input_path: str, output_path: str):
     """Декомпрессия файла, сжатого с использованием BWT+RLE."""
-
-    blocks = {}
     with open(input_path, "rb") as f_in:
-        block_number = 0
-        while True:
-            # Read number of indices
-            num_indices_bytes = f_in.read(4)
-            if not num_indices_bytes:
-                break
-
-            num_indices = int.from_bytes(num_indices_bytes, 'big')
-            indices = []
-            for _ in range(num_indices):
-                index = int.from_bytes(f_in.read(4), 'big')
-                indices.append(index)
+        data = f_in.read()
 
-            block_size = int.from_bytes(f_in.read(4), 'big')
-            compressed_block = f_in.read(block_size)
+    with open(output_path, "wb") as f_out:
+        pos = 0
+        while pos < len(data):
+            # Заголовок BWT блока и длина RLE-данных
+            chunk_size, block_length, indices, pos = deserialize_bwt_header(data, pos)
+            compressed_size, pos = decode_varint(data, pos)
+            compressed_block = data[pos:pos + compressed_size]
+            pos += compressed_size
 
             decompressed_transformed = rle_decompress(compressed_block)
-            decompressed_data = bwt_inverse(decompressed_transformed, indices)
-            blocks[block_number] = decompressed_data
-            block_number += 1
-
-    with open(output_path, "wb") as f_out:
-        for block_number in sorted(blocks.keys()):
-            f_out.write(blocks[block_number])
+            if len(decompressed_transformed) != block_length:
+                raise ValueError("Decoded BWT block length does not match the header")
+            f_out.write(bwt_inverse(decompressed_transformed, indices, chunk_size))
 
 
 if __name__ == "__main__":
@@ -1,57 +1,43 @@
 from algorithms.huffman import huffman_compress, huffman_decompress
-from algorithms.bwt import bwt_inverse, bwt_transform
+from algorithms.bwt import bwt_inverse, bwt_transform, deserialize_bwt_header, serialize_bwt_header
 from algorithms.mtf import mtf_inverse, mtf_transform
 from algorithms.rle import rle_compress, rle_decompress
 from file_analysis import analyze_compression
 
 
-def serialize_indices(indices: list[int]) -> bytes:
-    """Сериализация списка индексов BWT в bytes"""
-    return b''.join(i.to_bytes(4, 'big') for i in indices)
-
-
-def deserialize_indices(data: bytes) -> list[int]:
-    """Десериализация bytes в список индексов BWT"""
-    return [int.from_bytes(data[i:i + 4], 'big')
-            for i in range(0, len(data), 4)]
-
-
-def compress_file(input_path: str, output_path: str) -> None:
+def compress_file(input_path: str, output_path: str, chunk_size: int = 1024) -> None:
     """Сжатие файла по цепочке: BWT → RLE → MTF → Huffman"""
     with open(input_path, 'rb') as f:
         data = f.read()
 
     # Цепочка сжатия
-    transformed, bwt_indices = bwt_transform(data)
+    transformed, bwt_indices = bwt_transform(data, chunk_size)
     rle_compressed = rle_compress(transformed)
     mtf_compressed = mtf_transform(rle_compressed)
     final_compressed = huffman_compress(mtf_compressed)
 
-    # Сохраняем с индексами BWT
+    # Сохраняем с заголовком BWT (размер чанка, длина, индексы)
     with open(output_path, 'wb') as f:
-        # Записываем количество индексов (4 байта)
-        f.write(len(bwt_indices).to_bytes(4, 'big'))
-        # Записываем сами индексы (по 4 байта каждый)
-        f.write(serialize_indices(bwt_indices))
+        f.write(serialize_bwt_header(bwt_indices, chunk_size, len(data)))
         f.write(final_compressed)
 
 
 def decompress_file(input_path: str, output_path: str) -> None:
     """Распаковка файла"""
     with open(input_path, 'rb') as f:
-        # Читаем количество индексов
-        indices_count = int.from_bytes(f.read(4), 'big')
-        # Читаем индексы
-        indices_data = f.read(indices_count * 4)
-        bwt_indices = deserialize_indices(indices_data)
-        # Читаем сжатые данные
-        huffman_data = f.read()
+        data = f.read()
+
+    # Читаем заголовок BWT, остальное - сжатые данные
+    chunk_size, original_length, bwt_indices, pos = deserialize_bwt_header(data)
+    huffman_data = data[pos:]
 
     # Цепочка распаковки
     mtf_compressed = huffman_decompress(huffman_data)
     rle_compressed = mtf_inverse(mtf_compressed)
     bwt_transformed = rle_decompress(rle_compressed)
-    original_data = bwt_inverse(bwt_transformed, bwt_indices)
+    if len(bwt_transformed) != original_length:
+        raise ValueError("Decoded BWT block length does not match the header")
+    original_data = bwt_inverse(bwt_transformed, bwt_indices, chunk_size)
 
     with open(output_path, 'wb') as f:
         f.write(original_data)
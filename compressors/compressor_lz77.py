@@ -1,11 +1,15 @@
 import os
-from algorithms.lz77 import lz77_encode, lz77_decode
+from algorithms.lz77 import LZSSStreamDecoder, LZSSStreamEncoder
 from file_analysis import analyze_compression
 
+# Размер порции, которой читается входной файл
+CHUNK_SIZE = 1 << 20
+
 
 def compress_file(input_file: str, output_file: str, buffer_size: int = 8192):
     """
-    Сжимает файл с использованием алгоритма LZ77.
+    Сжимает файл с использованием алгоритма LZ77 (формат LZSS).
+    Файл читается порциями, поэтому память не зависит от его размера.
 
     :param input_file: Путь к исходному файлу
     :param output_file: Путь для сохранения сжатого файла
@@ -14,13 +18,14 @@ def compress_file(input_file: str, output_file: str, buffer_size: int = 8192):
     # Создаем директорию для выходного файла, если она не существует
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    with open(input_file, 'rb') as f_in:
-        data = f_in.read()
-
-    compressed_data = lz77_encode(data, buffer_size)
-
-    with open(output_file, 'wb') as f_out:
-        f_out.write(compressed_data)
+    encoder = LZSSStreamEncoder(buffer_size)
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        while True:
+            chunk = f_in.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            f_out.write(encoder.compress(chunk))
+        f_out.write(encoder.flush())
 
 
 def decompress_file(input_file: str, output_file: str):
@@ -33,13 +38,15 @@ def decompress_file(input_file: str, output_file: str):
     # Создаем директорию для выходного файла, если она не существует
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    with open(input_file, 'rb') as f_in:
-        compressed_data = f_in.read()
+    decoder = LZSSStreamDecoder()
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        while not decoder.eof:
+            chunk = f_in.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("Truncated LZSS stream")
+            f_out.write(decoder.decompress(chunk))
 
-    decompressed_data = lz77_decode(compressed_data)
 
-    with open(output_file, 'wb') as f_out:
-        f_out.write(decompressed_data)
 def main():
     # Обработка файла enwik7
     input_data = "C:/OPP/compression_project/tests/test1_enwik7"
@@ -106,4 +113,5 @@ def main():
     print("Цветное изображение:")
     analyze_compression(color_raw_path, color_compressed_path, color_decompressed_raw_path)
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
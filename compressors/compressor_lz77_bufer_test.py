@@ -1,6 +1,7 @@
 import os
 import math
 from collections import Counter
+from algorithms.lz77 import lzss_encode, lzss_decode
 from file_analysis import analyze_compression
 
 def calculate_compression_ratio(original_size: int, compressed_size: int) -> float:
@@ -45,80 +46,6 @@ def analyze_file(file_path: str):
     entropy = calculate_entropy(data)
     return file_size, entropy
 
-def lz77_encode(data: bytes, buffer_size: int = 8192) -> bytes:
-    """
-    Кодирует данные с использованием алгоритма LZ77.
-    :param data: Исходные данные (байтовая строка).
-    :param buffer_size: Размер буфера для поиска совпадений.
-    :return: Сжатые данные (байтовая строка).
-    """
-    encoded_data = bytearray()
-    i = 0
-    n = len(data)
-
-    while i < n:
-        max_length = 0
-        max_offset = 0
-
-        # Определяем границы поиска
-        search_start = max(0, i - buffer_size)
-        search_end = i
-
-        # Ищем максимальное совпадение
-        for length in range(min(255, n - i), 0, -1):
-            substring = data[i:i + length]
-            offset = data[search_start:search_end].rfind(substring)
-            if offset != -1:
-                max_length = length
-                max_offset = search_end - search_start - offset
-                break
-
-        if max_length > 0:
-            # Кодируем offset и length в два байта каждый
-            encoded_data.append((max_offset >> 8) & 0xFF)  # Старший байт offset
-            encoded_data.append(max_offset & 0xFF)  # Младший байт offset
-            encoded_data.append((max_length >> 8) & 0xFF)  # Старший байт length
-            encoded_data.append(max_length & 0xFF)  # Младший байт length
-            i += max_length
-        else:
-            # Если совпадений нет, кодируем как символ
-            encoded_data.append(0)  # offset = 0 (старший байт)
-            encoded_data.append(0)  # offset = 0 (младший байт)
-            encoded_data.append(0)  # length = 0 (старший байт)
-            encoded_data.append(0)  # length = 0 (младший байт)
-            encoded_data.append(data[i])  # символ (1 байт)
-            i += 1
-
-    return bytes(encoded_data)
-
-def lz77_decode(encoded_data: bytes) -> bytes:
-    """
-    Декодирует данные, сжатые с использованием алгоритма LZ77.
-    :param encoded_data: Сжатые данные (байтовая строка).
-    :return: Восстановленные данные (байтовая строка).
-    """
-    decoded_data = bytearray()
-    i = 0
-    n = len(encoded_data)
-
-    while i < n:
-        # Читаем offset и length (по два байта каждый)
-        offset = (encoded_data[i] << 8) | encoded_data[i + 1]
-        length = (encoded_data[i + 2] << 8) | encoded_data[i + 3]
-        i += 4
-
-        if offset == 0 and length == 0:
-            # Это символ
-            decoded_data.append(encoded_data[i])
-            i += 1
-        else:
-            # Это ссылка
-            start = len(decoded_data) - offset
-            end = start + length
-            decoded_data.extend(decoded_data[start:end])
-
-    return bytes(decoded_data)
-
 def compress_file(input_file: str, output_file: str, buffer_size: int = 512):
     """
     Сжимает файл с использованием алгоритма LZ77.
@@ -133,7 +60,7 @@ def compress_file(input_file: str, output_file: str, buffer_size: int = 512):
 
     with open(input_file, "rb") as f_in, open(output_file, "wb") as f_out:
         data = f_in.read()  # Читаем весь файл
-        compressed_data = lz77_encode(data, buffer_size)  # Сжимаем целиком
+        compressed_data = lzss_encode(data, buffer_size)  # Сжимаем целиком
         f_out.write(compressed_data)
 
 def decompress_file(input_file: str, output_file: str):
@@ -150,7 +77,7 @@ def decompress_file(input_file: str, output_file: str):
 
         with open(input_file, "rb") as f_in, open(output_file, "wb") as f_out:
             compressed_data = f_in.read()  # Читаем весь сжатый файл
-            decompressed_data = lz77_decode(compressed_data)  # Декодируем
+            decompressed_data = lzss_decode(compressed_data)  # Декодируем
             f_out.write(decompressed_data)  # Записываем восстановленные данные
     except Exception as e:
         print(f"Ошибка при распаковке файла: {e}")
@@ -213,7 +140,7 @@ def test_buffer_sizes(input_file: str, output_dir: str, buffer_sizes: list):
 
 if __name__ == "__main__":
     # Параметры тестирования
-    buffer_sizes = [2048, 4096, 8192, 16384] # Размеры буфера для тестирования
+    buffer_sizes = [2048, 4096, 8192, 16384, 32768] # Размеры буфера для тестирования
 
     # Обработка файла enwik7 (английский текст)
     input_enwik7 = "C:/OPP/compression_project/tests/test1_enwik7"
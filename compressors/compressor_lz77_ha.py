@@ -1,8 +1,12 @@
 import os
-from compressor_lz77 import lz77_encode, lz77_decode
-from compressor_ha import huffman_compress, huffman_decompress
+from algorithms.huffman import huffman_compress, huffman_decompress
+from algorithms.lz77 import LZSSStreamDecoder, LZSSStreamEncoder, lzss_encode, lzss_decode
+from algorithms.varint import encode_varint, read_varint
 from file_analysis import analyze_compression
 
+# Размер порции, которой читается входной файл
+CHUNK_SIZE = 1 << 20
+
 
 def lz77_huffman_compress(data: bytes, buffer_size: int = 8192) -> bytes:
     """
@@ -12,7 +16,7 @@ def lz77_huffman_compress(data: bytes, buffer_size: int = 8192) -> bytes:
     :return: Сжатые данные (байтовая строка).
     """
     # Шаг 1: LZ77
-    lz77_compressed = lz77_encode(data, buffer_size)
+    lz77_compressed = lzss_encode(data, buffer_size)
 
     # Шаг 2: Huffman
     huffman_compressed = huffman_compress(lz77_compressed)
@@ -29,13 +33,15 @@ def lz77_huffman_decompress(compressed_data: bytes) -> bytes:
     huffman_decompressed = huffman_decompress(compressed_data)
 
     # Шаг 2: LZ77
-    lz77_decompressed = lz77_decode(huffman_decompressed)
+    lz77_decompressed = lzss_decode(huffman_decompressed)
 
     return lz77_decompressed
 
 def compress_file(input_file: str, output_file: str, buffer_size: int = 512):
     """
     Сжимает файл с использованием LZ77 и Хаффмана.
+    Файл читается порциями; каждая готовая часть потока LZ77 сжимается Хаффманом отдельно
+    и записывается как [varint длина][данные], в конце - нулевая длина.
     :param input_file: Путь к исходному файлу.
     :param output_file: Путь к сжатому файлу.
     :param buffer_size: Размер буфера для LZ77.
@@ -44,10 +50,28 @@ def compress_file(input_file: str, output_file: str, buffer_size: int = 512):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    encoder = LZSSStreamEncoder(buffer_size)
     with open(input_file, "rb") as f_in, open(output_file, "wb") as f_out:
-        data = f_in.read()
-        compressed_data = lz77_huffman_compress(data, buffer_size)
-        f_out.write(compressed_data)
+        while True:
+            chunk = f_in.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            write_huffman_part(f_out, encoder.compress(chunk))
+        write_huffman_part(f_out, encoder.flush())
+        f_out.write(encode_varint(0))
+
+
+def write_huffman_part(f_out, part: bytes):
+    """
+    Сжимает часть потока LZ77 Хаффманом и записывает ее с длиной.
+    :param f_out: Выходной файл.
+    :param part: Часть потока LZ77 (пустая часть не записывается).
+    """
+    if part:
+        huffman_compressed = huffman_compress(part)
+        f_out.write(encode_varint(len(huffman_compressed)))
+        f_out.write(huffman_compressed)
+
 
 def decompress_file(input_file: str, output_file: str):
     """
@@ -59,10 +83,15 @@ def decompress_file(input_file: str, output_file: str):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    decoder = LZSSStreamDecoder()
     with open(input_file, "rb") as f_in, open(output_file, "wb") as f_out:
-        compressed_data = f_in.read()
-        decompressed_data = lz77_huffman_decompress(compressed_data)
-        f_out.write(decompressed_data)
+        while True:
+            part_size = read_varint(f_in)
+            if part_size == 0:
+                break
+            f_out.write(decoder.decompress(huffman_decompress(f_in.read(part_size))))
+    if not decoder.eof:
+        raise ValueError("Truncated LZSS stream")
 
 
 # Пример использования
@@ -0,0 +1,39 @@
+from algorithms.lzw import LZWDecoder, LZWEncoder
+
+
+def test_partial_decoding(input_file: str, parts_counts: list[int], capacity: int = 4096, policy: str = "reset"):
+    """
+    Проверяет, что поток кодов LZW декодируется одинаково целиком и частями:
+    ожидающая запись словаря должна переходить из одного вызова decode в следующий.
+    :param input_file: Путь к исходному файлу.
+    :param parts_counts: Список количеств частей, на которые делится поток кодов.
+    :param capacity: Емкость словаря (небольшая - чтобы проверить и заполнение словаря).
+    :param policy: Политика заполненного словаря.
+    """
+    with open(input_file, "rb") as f:
+        data = f.read()
+
+    codes = [code for code, _ in LZWEncoder(capacity, policy).tokens(data)]
+    print(f"Файл: {input_file}, кодов: {len(codes)}")
+
+    for parts in parts_counts:
+        decoder = LZWDecoder(capacity, policy)
+        step = max(1, (len(codes) + parts - 1) // parts)
+        # Каждый вызов возвращает только свою часть данных
+        decoded_data = b"".join(decoder.decode(codes[i:i + step]) for i in range(0, len(codes), step))
+        assert decoded_data == data, f"Ошибка: декодирование в {parts} частях не совпадает с исходными данными"
+        print(f"Частей: {parts} - данные совпадают")
+
+
+if __name__ == "__main__":
+    # Количества частей для проверки
+    parts_counts = [1, 2, 7, 100, 10000]
+
+    for input_data in ["C:/OPP/compression_project/tests/test2_rus.txt",
+                       "C:/OPP/compression_project/tests/test3_bin.exe",
+                       "C:/OPP/compression_project/tests/gray_image.raw"]:
+        for policy in ["reset", "freeze"]:
+            test_partial_decoding(input_data, parts_counts, policy=policy)
+        print("=" * 60)
+
+    print("Все тесты завершены.")
@@ -2,14 +2,17 @@ from PIL import Image
 import numpy as np
 import os
 
-def convert_png_to_raw(input_png_path: str, output_raw_path: str):
+def convert_png_to_raw(input_png_path: str, output_raw_path: str, mode: str = None):
     """
     Преобразует PNG-изображение в RAW-формат и сохраняет его.
     :param input_png_path: Путь к PNG-изображению.
     :param output_raw_path: Путь для сохранения RAW-файла.
+    :param mode: Режим, в который нужно перевести изображение (например, "1"); None - оставить как есть.
     """
     # Открываем изображение
     image = Image.open(input_png_path)
+    if mode is not None:
+        image = image.convert(mode)
     width, height = image.size
 
     # Преобразуем изображение в массив NumPy